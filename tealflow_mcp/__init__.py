@@ -15,6 +15,8 @@ The server helps with:
 
 __version__ = "0.1.3.post2"
 
+from typing import TYPE_CHECKING, Any
+
 from .core import PackageFilter, ResponseFormat
 from .models import (
     CheckDatasetRequirementsInput,
@@ -32,22 +34,32 @@ from .models import (
     SnapshotRenvEnvironmentInput,
 )
 
-from .tools import (
-    tealflow_check_dataset_requirements,
-    tealflow_check_shiny_startup,
-    tealflow_discover_datasets,
-    tealflow_generate_data_loading,
-    tealflow_generate_module_code,
-    tealflow_get_agent_guidance,
-    tealflow_get_app_template,
-    tealflow_get_dataset_info,
-    tealflow_get_module_details,
-    tealflow_list_datasets,
-    tealflow_list_modules,
-    tealflow_search_modules_by_analysis,
-    tealflow_setup_renv_environment,
-    tealflow_snapshot_renv_environment,
-)
+if TYPE_CHECKING:
+    from .tools import (
+        tealflow_check_dataset_requirements,
+        tealflow_check_shiny_startup,
+        tealflow_discover_datasets,
+        tealflow_generate_data_loading,
+        tealflow_generate_module_code,
+        tealflow_get_agent_guidance,
+        tealflow_get_app_template,
+        tealflow_get_dataset_info,
+        tealflow_get_module_details,
+        tealflow_list_datasets,
+        tealflow_list_modules,
+        tealflow_search_modules_by_analysis,
+        tealflow_setup_renv_environment,
+        tealflow_snapshot_renv_environment,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve tool functions lazily through the ``tools`` package."""
+    if name.startswith("tealflow_"):
+        from . import tools
+
+        return getattr(tools, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def main() -> None:
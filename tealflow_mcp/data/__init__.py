@@ -3,19 +3,31 @@ Data loading functionality for Teal Flow MCP Server.
 """
 
 from .loaders import (
+    _clear_data_cache,
+    _get_all_modules,
+    _get_app_template,
     _get_clinical_by_analysis_type,
     _get_clinical_module_requirements,
     _get_clinical_modules,
+    _get_data_version,
     _get_default_datasets,
     _get_general_by_analysis_type,
     _get_general_modules,
+    _get_lowercase_index,
+    _get_module_packages,
 )
 
 __all__ = [
+    "_clear_data_cache",
+    "_get_all_modules",
+    "_get_app_template",
     "_get_clinical_by_analysis_type",
     "_get_clinical_module_requirements",
     "_get_clinical_modules",
+    "_get_data_version",
     "_get_default_datasets",
     "_get_general_by_analysis_type",
     "_get_general_modules",
+    "_get_lowercase_index",
+    "_get_module_packages",
 ]
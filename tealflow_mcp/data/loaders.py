@@ -3,6 +3,7 @@ Data loading functions for Teal Flow MCP Server.
 """
 
 import json
+from functools import lru_cache
 from typing import Any
 
 from ..core.constants import KNOWLEDGE_BASE_DIR
@@ -10,32 +11,39 @@ from ..core.constants import KNOWLEDGE_BASE_DIR
 # Global data cache
 _MODULE_DATA_CACHE: dict[str, Any] = {}
 
+# Bumped whenever the cache is cleared, so derived caches elsewhere can key on it
+_DATA_VERSION = 0
+
 
 def _load_json_file(filename: str) -> dict[str, Any]:
     """Load and cache JSON data files from knowledge base."""
-    if filename not in _MODULE_DATA_CACHE:
-        file_path = KNOWLEDGE_BASE_DIR / filename
-        if not file_path.exists():
-            raise FileNotFoundError(f"Required data file not found: {filename}")
-
-        with open(file_path) as f:
-            _MODULE_DATA_CACHE[filename] = json.load(f)
+    data = _MODULE_DATA_CACHE.get(filename)
+    if data is None:
+        try:
+            with open(KNOWLEDGE_BASE_DIR / filename) as f:
+                data = json.load(f)
+            _MODULE_DATA_CACHE[filename] = data
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Required data file not found: {filename}") from None
 
-    return _MODULE_DATA_CACHE[filename]
+    return data
 
 
+@lru_cache(maxsize=1)
 def _get_clinical_modules() -> dict[str, Any]:
     """Get clinical modules data."""
     data = _load_json_file("teal_modules_clinical_dataset_requirements.json")
     return data.get("teal.modules.clinical_simple", {})
 
 
+@lru_cache(maxsize=1)
 def _get_clinical_module_requirements() -> dict[str, Any]:
     """Get detailed clinical module requirements."""
     data = _load_json_file("teal_modules_clinical_modules_requirements.json")
     return data.get("teal.modules.clinical_dataset_requirements", {})
 
 
+@lru_cache(maxsize=1)
 def _get_general_modules() -> dict[str, Any]:
     """Get general modules data."""
     data = _load_json_file("teal_modules_general_modules_requirements.json")
@@ -47,13 +55,80 @@ def _get_default_datasets() -> list[str]:
     return ["ADSL", "ADTTE", "ADRS", "ADQS", "ADAE"]
 
 
+@lru_cache(maxsize=1)
 def _get_clinical_by_analysis_type() -> dict[str, Any]:
     """Get clinical modules organized by analysis type."""
     data = _load_json_file("teal_modules_clinical_by_analysis_type.json")
     return data.get("teal.modules.clinical_by_analysis_type", {})
 
 
+@lru_cache(maxsize=1)
 def _get_general_by_analysis_type() -> dict[str, Any]:
     """Get general modules organized by analysis type."""
     data = _load_json_file("teal_modules_general_by_analysis_type.json")
     return data.get("teal.modules.general_by_analysis_type", {})
+
+
+@lru_cache(maxsize=1)
+def _get_app_template() -> str:
+    """Get the base R code template for Teal applications."""
+    try:
+        return (KNOWLEDGE_BASE_DIR / "app.template.R").read_text()
+    except FileNotFoundError:
+        raise FileNotFoundError("Required data file not found: app.template.R") from None
+
+
+@lru_cache(maxsize=2)
+def _get_lowercase_index(package: str) -> dict[str, tuple[str, str]]:
+    """
+    Get a module name -> (lowercased name, lowercased description) index.
+
+    Used for case-insensitive filtering of a package ('clinical' or 'general').
+    """
+    data = _get_clinical_modules() if package == "clinical" else _get_general_modules()
+    return {
+        name: (name.lower(), info.get("description", "").lower())
+        for name, info in data.get("modules", {}).items()
+    }
+
+
+@lru_cache(maxsize=1)
+def _get_module_packages() -> dict[str, str]:
+    """Get a module name -> package ('clinical' or 'general') index; clinical wins on clashes."""
+    packages = dict.fromkeys(_get_clinical_modules().get("modules", {}), "clinical")
+    for name in _get_general_modules().get("modules", {}):
+        packages.setdefault(name, "general")
+    return packages
+
+
+@lru_cache(maxsize=1)
+def _get_all_modules() -> dict[str, Any]:
+    """Get clinical and general modules merged into one dict; general wins on clashes."""
+    return {
+        **_get_clinical_modules().get("modules", {}),
+        **_get_general_modules().get("modules", {}),
+    }
+
+
+def _get_data_version() -> int:
+    """Get the current knowledge base load version (bumped by _clear_data_cache)."""
+    return _DATA_VERSION
+
+
+def _clear_data_cache() -> None:
+    """Clear all cached knowledge base data so it is re-read on next access."""
+    global _DATA_VERSION
+    _DATA_VERSION += 1
+    _MODULE_DATA_CACHE.clear()
+    for getter in (
+        _get_clinical_modules,
+        _get_clinical_module_requirements,
+        _get_general_modules,
+        _get_clinical_by_analysis_type,
+        _get_general_by_analysis_type,
+        _get_app_template,
+        _get_lowercase_index,
+        _get_module_packages,
+        _get_all_modules,
+    ):
+        getter.cache_clear()
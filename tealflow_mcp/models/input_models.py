@@ -8,11 +8,15 @@ from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from ..core.enums import PackageFilter, ResponseFormat
 
+# Shared config for all tool input models. Inputs are never mutated after
+# validation, so they are frozen rather than re-validated on assignment.
+_INPUT_MODEL_CONFIG = ConfigDict(str_strip_whitespace=True, frozen=True)
+
 
 class ListModulesInput(BaseModel):
     """Input model for listing Teal modules."""
 
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = _INPUT_MODEL_CONFIG
 
     package: PackageFilter = Field(
         default=PackageFilter.ALL, description="Filter by package: 'clinical', 'general', or 'all'"
@@ -29,7 +33,7 @@ class ListModulesInput(BaseModel):
 class GetModuleDetailsInput(BaseModel):
     """Input model for getting module details."""
 
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = _INPUT_MODEL_CONFIG
 
     module_name: str = Field(
         ...,
@@ -53,7 +57,7 @@ class GetModuleDetailsInput(BaseModel):
 class SearchModulesInput(BaseModel):
     """Input model for searching modules by analysis type."""
 
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = _INPUT_MODEL_CONFIG
 
     analysis_type: str = Field(
         ...,
@@ -79,7 +83,7 @@ class SearchModulesInput(BaseModel):
 class CheckDatasetRequirementsInput(BaseModel):
     """Input model for checking dataset requirements."""
 
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = _INPUT_MODEL_CONFIG
 
     module_name: str = Field(
         ..., description="Name of the module to check", min_length=3, max_length=100
@@ -98,7 +102,7 @@ class CheckDatasetRequirementsInput(BaseModel):
 class ListDatasetsInput(BaseModel):
     """Input model for listing datasets."""
 
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = _INPUT_MODEL_CONFIG
 
     response_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
@@ -109,7 +113,7 @@ class ListDatasetsInput(BaseModel):
 class GenerateModuleCodeInput(BaseModel):
     """Input model for generating module code."""
 
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = _INPUT_MODEL_CONFIG
 
     module_name: str = Field(
         ..., description="Name of the module to generate code for", min_length=3, max_length=100
@@ -125,7 +129,7 @@ class GenerateModuleCodeInput(BaseModel):
 class GetAppTemplateInput(BaseModel):
     """Input model for getting app template."""
 
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = _INPUT_MODEL_CONFIG
 
     response_format: ResponseFormat = Field(
         default=ResponseFormat.MARKDOWN,
@@ -136,7 +140,7 @@ class GetAppTemplateInput(BaseModel):
 class DiscoverDatasetsInput(BaseModel):
     """Input model for discovering datasets."""
 
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = _INPUT_MODEL_CONFIG
 
     data_directory: str = Field(
         description="Absolute path to the directory containing dataset files",
@@ -158,7 +162,7 @@ class DiscoverDatasetsInput(BaseModel):
 class GenerateDataLoadingInput(BaseModel):
     """Input model for generating data loading code."""
 
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = _INPUT_MODEL_CONFIG
 
     datasets: list[dict[str, Any]] = Field(
         ...,
@@ -184,7 +188,7 @@ class GenerateDataLoadingInput(BaseModel):
 class CheckShinyStartupInput(BaseModel):
     """Input model for checking Shiny app startup."""
 
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = _INPUT_MODEL_CONFIG
 
     app_path: str = Field(
         default=".",
@@ -221,7 +225,7 @@ class CheckShinyStartupInput(BaseModel):
 class SetupRenvEnvironmentInput(BaseModel):
     """Input model for setting up renv environment."""
 
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = _INPUT_MODEL_CONFIG
 
     project_path: str = Field(default=".", description="Path to the user's R project")
     response_format: ResponseFormat = Field(
@@ -232,7 +236,7 @@ class SetupRenvEnvironmentInput(BaseModel):
 class SnapshotRenvEnvironmentInput(BaseModel):
     """Input model for snapshotting renv environment."""
 
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = _INPUT_MODEL_CONFIG
 
     project_path: str = Field(default=".", description="Path to the R project directory")
     response_format: ResponseFormat = Field(
@@ -243,7 +247,7 @@ class SnapshotRenvEnvironmentInput(BaseModel):
 class GetDatasetInfoInput(BaseModel):
     """Input model for getting dataset information."""
 
-    model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
+    model_config = _INPUT_MODEL_CONFIG
 
     file_path: str = Field(
         ...,
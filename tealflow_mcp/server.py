@@ -5,6 +5,7 @@ This module contains the MCP server setup and tool registration.
 It should be imported and run via the main() function in __init__.py.
 """
 
+import logging
 from typing import Any
 
 from mcp.server.fastmcp import FastMCP
@@ -40,8 +41,11 @@ from .tools import (
     tealflow_search_modules_by_analysis,
     tealflow_setup_renv_environment,
     tealflow_snapshot_renv_environment,
+    warm_search_indexes,
 )
 
+logger = logging.getLogger(__name__)
+
 # Type alias for MCP tool annotations to satisfy mypy
 # FastMCP expects a ToolAnnotations type that's not publicly exported
 ToolAnnotations = dict[str, Any]
@@ -992,4 +996,11 @@ def run_server() -> None:
 
     This function should be called from the package's main() entry point.
     """
+    # Load the knowledge base and build the search indexes before serving, so the
+    # first search request does not pay for them. A broken knowledge base only
+    # affects the tools that use it, so the server starts regardless.
+    try:
+        warm_search_indexes()
+    except (OSError, ValueError) as e:
+        logger.warning("Could not prebuild search indexes: %s", e)
     mcp.run()
@@ -1,23 +1,66 @@
 """
 Tool implementations for Teal Flow MCP Server.
+
+Tool submodules are imported lazily on first attribute access so that importing
+this package does not pull in every tool's dependencies up front.
 """
 
-from .agent_guidance import tealflow_get_agent_guidance
-from .check_shiny_startup import tealflow_check_shiny_startup
-from .code_generation import tealflow_generate_module_code
-from .data_loading import tealflow_generate_data_loading
-from .dataset_discovery import tealflow_discover_datasets
-from .dataset_info import tealflow_get_dataset_info
-from .list_modules import tealflow_list_modules
-from .module_details import tealflow_get_module_details
-from .setup_renv import tealflow_setup_renv_environment
-from .snapshot_renv import tealflow_snapshot_renv_environment
-from .other_tools import (
-    tealflow_check_dataset_requirements,
-    tealflow_get_app_template,
-    tealflow_list_datasets,
-    tealflow_search_modules_by_analysis,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .agent_guidance import tealflow_get_agent_guidance
+    from .check_shiny_startup import tealflow_check_shiny_startup
+    from .code_generation import tealflow_generate_module_code
+    from .data_loading import tealflow_generate_data_loading
+    from .dataset_discovery import tealflow_discover_datasets
+    from .dataset_info import tealflow_get_dataset_info
+    from .list_modules import tealflow_list_modules
+    from .module_details import tealflow_get_module_details
+    from .setup_renv import tealflow_setup_renv_environment
+    from .snapshot_renv import tealflow_snapshot_renv_environment
+    from .other_tools import (
+        tealflow_check_dataset_requirements,
+        tealflow_get_app_template,
+        tealflow_list_datasets,
+        tealflow_search_modules_by_analysis,
+        warm_search_indexes,
+    )
+
+# Public name (tools and their helpers) -> submodule that defines it
+_TOOL_MODULES = {
+    "tealflow_check_dataset_requirements": "other_tools",
+    "tealflow_check_shiny_startup": "check_shiny_startup",
+    "tealflow_discover_datasets": "dataset_discovery",
+    "tealflow_generate_data_loading": "data_loading",
+    "tealflow_generate_module_code": "code_generation",
+    "tealflow_get_agent_guidance": "agent_guidance",
+    "tealflow_get_app_template": "other_tools",
+    "tealflow_get_dataset_info": "dataset_info",
+    "tealflow_get_module_details": "module_details",
+    "tealflow_list_datasets": "other_tools",
+    "tealflow_list_modules": "list_modules",
+    "tealflow_search_modules_by_analysis": "other_tools",
+    "tealflow_setup_renv_environment": "setup_renv",
+    "tealflow_snapshot_renv_environment": "snapshot_renv",
+    "warm_search_indexes": "other_tools",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule defining ``name`` on first access (PEP 562)."""
+    module_name = _TOOL_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_TOOL_MODULES])
+
 
 __all__ = [
     "tealflow_check_dataset_requirements",
@@ -34,4 +77,5 @@ __all__ = [
     "tealflow_search_modules_by_analysis",
     "tealflow_setup_renv_environment",
     "tealflow_snapshot_renv_environment",
+    "warm_search_indexes",
 ]
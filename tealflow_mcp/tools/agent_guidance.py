@@ -4,15 +4,12 @@ Prompt generation functions for TealFlow MCP Server.
 
 from ..core.constants import KNOWLEDGE_BASE_DIR
 
+_AGENT_MD_PATH = KNOWLEDGE_BASE_DIR / "agent.md"
+
 
 async def tealflow_get_agent_guidance() -> str:
     """Read and return the agent guidance document."""
-    agent_md_path = KNOWLEDGE_BASE_DIR / "agent.md"
-
-    if not agent_md_path.exists():
+    try:
+        return _AGENT_MD_PATH.read_bytes().decode("utf-8")
+    except FileNotFoundError:
         return "Error: Agent guidance document not found."
-
-    with open(agent_md_path, encoding="utf-8") as f:
-        content = f.read()
-
-    return content
@@ -12,6 +12,26 @@ from pathlib import Path
 
 from ..models import CheckShinyStartupInput
 
+# Shiny startup markers; Shiny logs these to stderr, so search it first
+_RE_LISTENING = re.compile(r"Listening on|Starting Shiny", re.IGNORECASE)
+
+
+def _make_result(
+    status: str, error_type: str | None, message: str, logs_excerpt: str
+) -> dict[str, str | None]:
+    """Build the result dictionary returned by the startup check."""
+    return {
+        "status": status,
+        "error_type": error_type,
+        "message": message,
+        "logs_excerpt": logs_excerpt,
+    }
+
+
+def _dump(result: dict[str, str | None]) -> str:
+    """Serialize a startup check result to JSON."""
+    return json.dumps(result, indent=2)
+
 
 def _classify_error(stderr_output: str, stdout_output: str) -> tuple[str | None, str]:
     """
@@ -81,10 +101,11 @@ def _get_log_excerpt(stdout: str, stderr: str, max_lines: int = 30) -> str:
     if not combined.strip():
         return "No output captured"
 
-    # Take last N lines
-    lines = combined.split("\n")
+    # Take last N lines; rsplit only materializes max_lines + 1 pieces, with
+    # any earlier output left in the first piece
+    lines = combined.rsplit("\n", max_lines)
     if len(lines) > max_lines:
-        lines = ["... (output truncated) ...", *lines[-max_lines:]]
+        lines[0] = "... (output truncated) ..."
 
     return "\n".join(lines)
 
@@ -109,13 +130,15 @@ async def tealflow_check_shiny_startup(params: CheckShinyStartupInput) -> str:
 
         # Validate app file exists
         if not app_file.exists():
-            result = {
-                "status": "error",
-                "error_type": "file_not_found",
-                "message": f"{params.app_filename} not found at {app_file}",
-                "logs_excerpt": f"Expected file: {app_file}\nDirectory contents: {list(app_path.glob('*')) if app_path.exists() else 'directory does not exist'}",
-            }
-            return json.dumps(result, indent=2)
+            contents = list(app_path.glob("*")) if app_path.exists() else "directory does not exist"
+            return _dump(
+                _make_result(
+                    "error",
+                    "file_not_found",
+                    f"{params.app_filename} not found at {app_file}",
+                    f"Expected file: {app_file}\nDirectory contents: {contents}",
+                )
+            )
 
         # Run Rscript with shiny::runApp() and timeout
         try:
@@ -126,75 +149,72 @@ async def tealflow_check_shiny_startup(params: CheckShinyStartupInput) -> str:
                 cwd=str(app_path),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
                 env={**os.environ, "R_BROWSER": "false"},  # Prevent browser from opening
             )
 
-            # Wait with timeout
+            # Wait with timeout; pipes are read as bytes and decoded once at the end
             try:
-                stdout, stderr = process.communicate(timeout=params.timeout_seconds)
+                stdout_b, stderr_b = process.communicate(timeout=params.timeout_seconds)
             except subprocess.TimeoutExpired:
                 # Timeout reached - this could be success (app running) or hanging
                 process.kill()
-                stdout, stderr = process.communicate()
+                stdout_b, stderr_b = process.communicate()
+                stdout = stdout_b.decode("utf-8", "replace")
+                stderr = stderr_b.decode("utf-8", "replace")
 
                 # Check if app successfully started before timeout
-                combined_output = stdout + stderr
-                if re.search(r"Listening on|Starting Shiny", combined_output, re.IGNORECASE):
-                    result = {
-                        "status": "ok",
-                        "error_type": None,
-                        "message": "App started successfully (reached listening state)",
-                        "logs_excerpt": _get_log_excerpt(stdout, stderr, max_lines=20),
-                    }
-                else:
-                    result = {
-                        "status": "error",
-                        "error_type": "timeout",
-                        "message": f"App did not start within {params.timeout_seconds} seconds",
-                        "logs_excerpt": _get_log_excerpt(stdout, stderr),
-                    }
-                return json.dumps(result, indent=2)
+                if _RE_LISTENING.search(stderr) or _RE_LISTENING.search(stdout):
+                    return _dump(
+                        _make_result(
+                            "ok",
+                            None,
+                            "App started successfully (reached listening state)",
+                            _get_log_excerpt(stdout, stderr, max_lines=20),
+                        )
+                    )
+                return _dump(
+                    _make_result(
+                        "error",
+                        "timeout",
+                        f"App did not start within {params.timeout_seconds} seconds",
+                        _get_log_excerpt(stdout, stderr),
+                    )
+                )
 
             # Process completed within timeout
-            # Check for successful startup indicators
-            combined_output = stdout + stderr
+            stdout = stdout_b.decode("utf-8", "replace")
+            stderr = stderr_b.decode("utf-8", "replace")
 
-            if process.returncode == 0 or re.search(
-                r"Listening on|Starting Shiny", combined_output, re.IGNORECASE
+            # Check for successful startup indicators
+            if (
+                process.returncode == 0
+                or _RE_LISTENING.search(stderr)
+                or _RE_LISTENING.search(stdout)
             ):
-                result = {
-                    "status": "ok",
-                    "error_type": None,
-                    "message": "App started successfully",
-                    "logs_excerpt": _get_log_excerpt(stdout, stderr, max_lines=20),
-                }
-            else:
-                # Process exited with error
-                error_type, error_message = _classify_error(stderr, stdout)
-                result = {
-                    "status": "error",
-                    "error_type": error_type,
-                    "message": error_message,
-                    "logs_excerpt": _get_log_excerpt(stdout, stderr),
-                }
-
-            return json.dumps(result, indent=2)
+                return _dump(
+                    _make_result(
+                        "ok",
+                        None,
+                        "App started successfully",
+                        _get_log_excerpt(stdout, stderr, max_lines=20),
+                    )
+                )
+
+            # Process exited with error
+            error_type, error_message = _classify_error(stderr, stdout)
+            return _dump(
+                _make_result("error", error_type, error_message, _get_log_excerpt(stdout, stderr))
+            )
 
         except FileNotFoundError:
-            result = {
-                "status": "error",
-                "error_type": "rscript_not_found",
-                "message": "Rscript command not found. Is R installed?",
-                "logs_excerpt": "Cannot execute Rscript. Please ensure R is installed and in PATH.",
-            }
-            return json.dumps(result, indent=2)
+            return _dump(
+                _make_result(
+                    "error",
+                    "rscript_not_found",
+                    "Rscript command not found. Is R installed?",
+                    "Cannot execute Rscript. Please ensure R is installed and in PATH.",
+                )
+            )
 
     except Exception as e:
-        result = {
-            "status": "error",
-            "error_type": "internal_error",
-            "message": f"Internal error: {e!s}",
-            "logs_excerpt": str(e),
-        }
-        return json.dumps(result, indent=2)
+        return _dump(_make_result("error", "internal_error", f"Internal error: {e!s}", str(e)))
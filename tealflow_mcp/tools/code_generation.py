@@ -2,13 +2,187 @@
 Code generation tool implementation.
 """
 
-from ..data import _get_clinical_module_requirements, _get_clinical_modules, _get_general_modules
+from collections.abc import Iterator
+from functools import lru_cache
+from string import Template
+from typing import Any
+
+from ..data import (
+    _get_clinical_module_requirements,
+    _get_clinical_modules,
+    _get_data_version,
+    _get_general_modules,
+)
 from ..models import GenerateModuleCodeInput
 from ..utils import _validate_module_exists
 
+# R code fragments for general modules. The boilerplate is static apart from a
+# few names, so it is kept as pre-built templates instead of assembled line by line.
+_GENERAL_HEADER = Template(
+    """\
+# ${description}
+# General module - works with any data.frame
+# Configure data_extract_spec for your specific datasets
+"""
+)
+
+_PARAM_COMMENT = Template("  # ${param_description}")
+
+_LABEL_PARAM = Template('  label = "${description}"')
+
+_OTHER_PARAM = Template("  # TODO: Configure this parameter\n  ${param_name} = ${default}")
+
+# Everything after the parameter name is constant, so the data_extract_spec
+# blocks are fully pre-rendered and only prefixed with the name at runtime.
+_DATA_EXTRACT_SPEC_SELECT = """ = data_extract_spec(
+    dataname = "ADSL",  # TODO: Specify your dataset name
+    select = select_spec(
+      label = "Select variable:",
+      choices = variable_choices("ADSL"),  # TODO: Specify available columns
+      selected = NULL,  # TODO: Set default selection
+      multiple = FALSE,  # Set TRUE to allow multiple selections
+      fixed = FALSE  # Set TRUE to prevent user changes
+    )
+"""
+
+_DATA_EXTRACT_SPEC_FILTER_COMMENTS = """\
+    # Optional: Add filter_spec to subset data before selection
+    # filter = filter_spec(
+    #   label = "Filter data:",
+    #   vars = c("ARM", "SEX"),  # Variables to filter on
+    #   choices = value_choices("ADSL", "ARM"),  # Available values
+    #   selected = NULL,  # Default filter values
+    #   multiple = TRUE  # Allow multiple selections
+    # )
+"""
+
+_DATA_EXTRACT_SPEC_PARAM = _DATA_EXTRACT_SPEC_SELECT + "  )"
+
+_DATA_EXTRACT_SPEC_PARAM_WITH_COMMENTS = (
+    _DATA_EXTRACT_SPEC_SELECT + _DATA_EXTRACT_SPEC_FILTER_COMMENTS + "  )"
+)
+
+_GENERAL_EXAMPLES = """
+# Example with actual configuration for ADSL dataset:
+# x = data_extract_spec(
+#   dataname = "ADSL",
+#   select = select_spec(
+#     label = "Select X variable:",
+#     choices = variable_choices(ADSL, c("AGE", "BMRKR1", "BMRKR2")),
+#     selected = "AGE",
+#     multiple = FALSE,
+#     fixed = FALSE
+#   )
+# )
+
+# For long datasets with filtering:
+# y = data_extract_spec(
+#   dataname = "ADLB",
+#   filter = filter_spec(
+#     vars = "PARAMCD",
+#     choices = value_choices(ADLB, "PARAMCD", "PARAM"),
+#     selected = "ALT",
+#     multiple = FALSE
+#   ),
+#   select = select_spec(
+#     choices = "AVAL",
+#     selected = "AVAL",
+#     fixed = TRUE
+#   )
+# )
+
+# Use tealflow_get_module_details for complete parameter documentation"""
+
+# Clinical modules take direct dataset/variable references, which cannot be
+# derived from the metadata, so every required parameter gets a placeholder.
+_CLINICAL_PARAM_PLACEHOLDER = Template("  ${param_name} = # TODO: Configure ${param_name}")
+
+_CLINICAL_OPTIONAL_COMMENT = "  # Optional parameters - adjust as needed"
+
+_CLINICAL_HEADER = Template(
+    """\
+# ${description}
+# Required datasets: ${required_datasets}
+"""
+)
+
+_CLINICAL_FOOTER = """
+# Note: Adjust parameters based on your specific requirements
+# Use tealflow_get_module_details for complete parameter documentation"""
+
+
+def _emit_general_params(
+    req_params: dict[str, Any],
+    opt_params: dict[str, Any],
+    description: str,
+    include_comments: bool,
+) -> Iterator[str]:
+    """
+    Yield the required parameters of a general module, one block per parameter.
+
+    Blocks carry no trailing comma; callers join them with ",\\n".
+    """
+    data_extract_spec_param = (
+        _DATA_EXTRACT_SPEC_PARAM_WITH_COMMENTS if include_comments else _DATA_EXTRACT_SPEC_PARAM
+    )
+
+    # Each block holds the full (possibly multi-line) code for one parameter
+    for param_name, param_info in (req_params or {}).items():
+        if param_name == "label":
+            # Simple string parameter
+            yield _LABEL_PARAM.substitute(description=description)
+            continue
+
+        comment = (
+            _PARAM_COMMENT.substitute(param_description=param_info.get("description", "")) + "\n"
+            if include_comments
+            else ""
+        )
+
+        param_type = param_info.get("type")
+        if isinstance(param_type, str) and "data_extract_spec" in param_type:
+            # Generate data_extract_spec structure
+            block = f"  {param_name}{data_extract_spec_param}"
+        else:
+            # Other parameter types
+            default = opt_params.get(param_name, {}).get("default", "NULL")
+            block = _OTHER_PARAM.substitute(param_name=param_name, default=default)
+
+        yield comment + block
+
+
+def _iter_general_module_code(
+    module_name: str,
+    include_comments: bool,
+    module_info: dict[str, Any],
+    basic_info: dict[str, Any],
+) -> Iterator[str]:
+    """Yield the non-empty code segments of a general module, in order."""
+    description: str = basic_info.get("description", module_name)
+
+    func_params = module_info.get("function_parameters", {}) or module_info
+    req_params = func_params.get("required_parameters", {})
+    opt_params = func_params.get("optional_parameters", {})
+
+    # Header and examples are only emitted with comments
+    if include_comments:
+        yield _GENERAL_HEADER.substitute(description=description)
+    yield f"{module_name}("
+    params_block = ",\n".join(
+        _emit_general_params(req_params, opt_params, description, include_comments)
+    )
+    if params_block:
+        yield params_block
+    yield ")"
+    if include_comments:
+        yield _GENERAL_EXAMPLES
+
 
 def _generate_general_module_code(
-    params: GenerateModuleCodeInput, module_info: dict, basic_info: dict
+    module_name: str,
+    include_comments: bool,
+    module_info: dict[str, Any],
+    basic_info: dict[str, Any],
 ) -> str:
     """
     Generate R code for general modules using data_extract_spec patterns.
@@ -17,113 +191,102 @@ def _generate_general_module_code(
     and filtering capabilities. This function generates the full structure with
     TODO comments for dataset-specific configuration.
     """
-    lines = []
+    return "\n".join(
+        _iter_general_module_code(module_name, include_comments, module_info, basic_info)
+    )
+
+
+def _emit_clinical_params(req_params: dict[str, Any], include_comments: bool) -> Iterator[str]:
+    """Yield the required parameters of a clinical module as placeholder blocks."""
+    for param_name, param_info in (req_params or {}).items():
+        # Generic placeholder
+        block = _CLINICAL_PARAM_PLACEHOLDER.substitute(param_name=param_name)
+        if include_comments:
+            comment = _PARAM_COMMENT.substitute(param_description=param_info.get("description", ""))
+            block = f"{comment}\n{block}"
+        yield block
+
+
+def _iter_clinical_module_code(
+    module_name: str,
+    include_comments: bool,
+    module_info: dict[str, Any],
+    basic_info: dict[str, Any],
+) -> Iterator[str]:
+    """Yield the non-empty code segments of a clinical module, in order."""
+    func_params = module_info.get("function_parameters", {})
+    req_params = func_params.get("required_params", {})
+
+    if include_comments:
+        description: str = basic_info.get("description", module_name)
+        required_datasets: list[str] = basic_info.get("required_datasets", [])
+        yield _CLINICAL_HEADER.substitute(
+            description=description, required_datasets=", ".join(required_datasets)
+        )
+    yield f"{module_name}("
+    params_block = ",\n".join(_emit_clinical_params(req_params, include_comments))
+    if params_block:
+        yield params_block
+    if include_comments:
+        # Add some common optional parameters
+        yield _CLINICAL_OPTIONAL_COMMENT
+    yield ")"
+    if include_comments:
+        yield _CLINICAL_FOOTER
 
-    if params.include_comments:
-        lines.append(f"# {basic_info.get('description', params.module_name)}")
-        lines.append("# General module - works with any data.frame")
-        lines.append("# Configure data_extract_spec for your specific datasets")
-        lines.append("")
 
-    lines.append(f"{params.module_name}(")
+def _generate_clinical_module_code(
+    module_name: str,
+    include_comments: bool,
+    module_info: dict[str, Any],
+    basic_info: dict[str, Any],
+) -> str:
+    """
+    Generate R code for clinical modules.
+
+    The code is assembled from a few large blocks (header, module call with its
+    parameters, footer) rather than one flat list of lines.
+    """
+    return "\n".join(
+        _iter_clinical_module_code(module_name, include_comments, module_info, basic_info)
+    )
 
-    func_params = module_info.get("function_parameters", {}) or module_info
-    req_params = func_params.get("required_parameters", {})
-    opt_params = func_params.get("optional_parameters", {})
 
-    param_lines = []
-
-    # Process required parameters
-    if req_params:
-        for param_name, param_info in req_params.items():
-            if param_name == "label":
-                # Simple string parameter
-                param_lines.append(
-                    f'  label = "{basic_info.get("description", params.module_name)}",'
-                )
-
-            elif "data_extract_spec" in str(param_info.get("type", "")):
-                # Generate data_extract_spec structure
-                if params.include_comments:
-                    param_lines.append(f"  # {param_info.get('description', '')}")
-
-                param_lines.append(f"  {param_name} = data_extract_spec(")
-                param_lines.append('    dataname = "ADSL",  # TODO: Specify your dataset name')
-                param_lines.append("    select = select_spec(")
-                param_lines.append('      label = "Select variable:",')
-                param_lines.append(
-                    '      choices = variable_choices("ADSL"),  # TODO: Specify available columns'
-                )
-                param_lines.append("      selected = NULL,  # TODO: Set default selection")
-                param_lines.append(
-                    "      multiple = FALSE,  # Set TRUE to allow multiple selections"
-                )
-                param_lines.append("      fixed = FALSE  # Set TRUE to prevent user changes")
-                param_lines.append("    )")
-
-                if params.include_comments:
-                    param_lines.append(
-                        "    # Optional: Add filter_spec to subset data before selection"
-                    )
-                    param_lines.append("    # filter = filter_spec(")
-                    param_lines.append('    #   label = "Filter data:",')
-                    param_lines.append('    #   vars = c("ARM", "SEX"),  # Variables to filter on')
-                    param_lines.append(
-                        '    #   choices = value_choices("ADSL", "ARM"),  # Available values'
-                    )
-                    param_lines.append("    #   selected = NULL,  # Default filter values")
-                    param_lines.append("    #   multiple = TRUE  # Allow multiple selections")
-                    param_lines.append("    # )")
-
-                param_lines.append("  ),")
-            else:
-                # Other parameter types
-                if params.include_comments:
-                    param_lines.append(f"  # {param_info.get('description', '')}")
-                default = opt_params.get(param_name, {}).get("default", "NULL")
-                param_lines.append(f"  {param_name} = {default},  # TODO: Configure this parameter")
-
-    # Remove trailing comma from last parameter
-    if param_lines and param_lines[-1].endswith(","):
-        param_lines[-1] = param_lines[-1][:-1]
-
-    lines.extend(param_lines)
-    lines.append(")")
-
-    # Add helpful examples
-    if params.include_comments:
-        lines.append("")
-        lines.append("# Example with actual configuration for ADSL dataset:")
-        lines.append("# x = data_extract_spec(")
-        lines.append('#   dataname = "ADSL",')
-        lines.append("#   select = select_spec(")
-        lines.append('#     label = "Select X variable:",')
-        lines.append('#     choices = variable_choices(ADSL, c("AGE", "BMRKR1", "BMRKR2")),')
-        lines.append('#     selected = "AGE",')
-        lines.append("#     multiple = FALSE,")
-        lines.append("#     fixed = FALSE")
-        lines.append("#   )")
-        lines.append("# )")
-        lines.append("")
-        lines.append("# For long datasets with filtering:")
-        lines.append("# y = data_extract_spec(")
-        lines.append('#   dataname = "ADLB",')
-        lines.append("#   filter = filter_spec(")
-        lines.append('#     vars = "PARAMCD",')
-        lines.append('#     choices = value_choices(ADLB, "PARAMCD", "PARAM"),')
-        lines.append('#     selected = "ALT",')
-        lines.append("#     multiple = FALSE")
-        lines.append("#   ),")
-        lines.append("#   select = select_spec(")
-        lines.append('#     choices = "AVAL",')
-        lines.append('#     selected = "AVAL",')
-        lines.append("#     fixed = TRUE")
-        lines.append("#   )")
-        lines.append("# )")
-        lines.append("")
-        lines.append("# Use tealflow_get_module_details for complete parameter documentation")
-
-    return "\n".join(lines)
+@lru_cache(maxsize=512)
+def _generate_module_code_sync(module_name: str, include_comments: bool, data_version: int) -> str:
+    """
+    Generate R code for a module.
+
+    The output only depends on the arguments and the knowledge base, so repeated
+    requests for the same module are served from the cache. ``data_version`` keys
+    the cache to the current knowledge base load, so entries are not reused after
+    a reload.
+    """
+    # Validate module exists
+    exists, package, suggestion = _validate_module_exists(module_name)
+
+    if not exists:
+        msg = f"Error: Module '{module_name}' not found."
+        if suggestion:
+            msg += f" Did you mean '{suggestion}'?"
+        return msg
+
+    # Get module requirements
+    if package == "clinical":
+        requirements_data = _get_clinical_module_requirements()
+        modules = requirements_data.get("modules", {})
+        module_info = modules.get(module_name, {})
+        clinical_data = _get_clinical_modules()
+        basic_info = clinical_data.get("modules", {}).get(module_name, {})
+    else:  # general
+        general_data = _get_general_modules()
+        modules = general_data.get("modules", {})
+        module_info = modules.get(module_name, {})
+        basic_info = module_info
+        # For general modules, use specialized generation
+        return _generate_general_module_code(module_name, include_comments, module_info, basic_info)
+
+    return _generate_clinical_module_code(module_name, include_comments, module_info, basic_info)
 
 
 async def tealflow_generate_module_code(params: GenerateModuleCodeInput) -> str:
@@ -134,75 +297,11 @@ async def tealflow_generate_module_code(params: GenerateModuleCodeInput) -> str:
     Clinical modules use direct dataset references, while general modules use
     data_extract_spec patterns. Includes optional comments and parameter overrides.
     """
+    # Unknown modules are reported by the helper itself; only malformed knowledge
+    # base entries can raise here
     try:
-        # Validate module exists
-        exists, package, suggestion = _validate_module_exists(params.module_name)
-
-        if not exists:
-            msg = f"Error: Module '{params.module_name}' not found."
-            if suggestion:
-                msg += f" Did you mean '{suggestion}'?"
-            return msg
-
-        # Get module requirements
-        if package == "clinical":
-            requirements_data = _get_clinical_module_requirements()
-            modules = requirements_data.get("modules", {})
-            module_info = modules.get(params.module_name, {})
-            clinical_data = _get_clinical_modules()
-            basic_info = clinical_data.get("modules", {}).get(params.module_name, {})
-        else:  # general
-            general_data = _get_general_modules()
-            modules = general_data.get("modules", {})
-            module_info = modules.get(params.module_name, {})
-            basic_info = module_info
-            # For general modules, use specialized generation
-            return _generate_general_module_code(params, module_info, basic_info)
-
-        # Generate code for clinical modules
-        lines = []
-
-        if params.include_comments:
-            lines.append(f"# {basic_info.get('description', params.module_name)}")
-            lines.append(
-                f"# Required datasets: {', '.join(basic_info.get('required_datasets', []))}"
-            )
-            lines.append("")
-
-        # Start module call
-        lines.append(f"{params.module_name}(")
-
-        # Add required parameters
-        func_params = module_info.get("function_parameters", {})
-        req_params = func_params.get("required_params", {})
-
-        param_lines = []
-
-        if req_params:
-            for param_name, param_info in req_params.items():
-                if params.include_comments:
-                    param_lines.append(f"  # {param_info.get('description', '')}")
-
-                # Generic placeholder
-                param_lines.append(f"  {param_name} = # TODO: Configure {param_name},")
-
-        # Add some common optional parameters
-        if params.include_comments:
-            param_lines.append("  # Optional parameters - adjust as needed")
-
-        # Remove trailing comma from last parameter
-        if param_lines and param_lines[-1].endswith(","):
-            param_lines[-1] = param_lines[-1][:-1]
-
-        lines.extend(param_lines)
-        lines.append(")")
-
-        if params.include_comments:
-            lines.append("")
-            lines.append("# Note: Adjust parameters based on your specific requirements")
-            lines.append("# Use tealflow_get_module_details for complete parameter documentation")
-
-        return "\n".join(lines)
-
-    except Exception as e:
+        return _generate_module_code_sync(
+            params.module_name, params.include_comments, _get_data_version()
+        )
+    except (KeyError, AttributeError) as e:
         return f"Error generating code: {e!s}"
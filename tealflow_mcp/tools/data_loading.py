@@ -5,35 +5,182 @@ This module provides functionality for generating R code that loads ADaM dataset
 and creates teal_data objects.
 """
 
-from pathlib import Path
+import os
+from collections.abc import Callable
+from functools import lru_cache
+from operator import itemgetter
+from string import Template
 from typing import Any
 
 from ..core.enums import ResponseFormat
 from ..models.input_models import GenerateDataLoadingInput
+from ..utils.formatters import _dumps_json
 from .format_handlers import get_format_handler_by_name
 
+_DATA_LOADING_HEADER = "library(teal)\n\n"
 
-def _convert_to_relative_path(absolute_path: str, project_dir: str) -> str | None:
+# Format name -> bound get_loading_code of its handler, filled on first use.
+# Only supported formats are cached, so the dict stays small.
+_LOADER_CACHE: dict[str, Callable[[str, str], str]] = {}
+
+# Markdown response wrapper; only the code and the dataset list vary
+_DATA_LOADING_MARKDOWN = Template(
+    """\
+# Data Loading Code
+
+Save this code as `data.R` in your project root:
+
+```r
+${code}
+```
+
+## Usage
+
+1. Save the code above as `data.R` in your project root directory
+2. The app template will load this with `source("data.R")`
+
+## Datasets Included
+
+${dataset_list}"""
+)
+
+# Sort key and name accessor for dataset dictionaries
+_dataset_name = itemgetter("name")
+
+_NON_STANDARD_JOIN_KEYS = (
+    "  # WARNING: Non-standard datasets detected.\n"
+    "  # You may need to configure join_keys manually.\n"
+    "  # join_keys = ..."
+)
+
+
+def _normalize_project_dir(project_dir: str | None) -> str | None:
+    """
+    Normalize the project directory once per data loading request.
+
+    Returns:
+        Absolute, normalized project path, or None if no directory was given
+    """
+    return os.path.abspath(project_dir) if project_dir else None
+
+
+def _convert_to_relative_path(absolute_path: str, proj_path: str) -> str | None:
     """
     Convert absolute path to relative path if it's within the project directory.
 
+    The containment check is a lexical prefix test on normalized paths (no
+    symlink resolution), so it neither touches the filesystem nor raises.
+
     Args:
         absolute_path: Absolute path to the file
-        project_dir: Absolute path to the project directory
+        proj_path: Already normalized absolute path of the project directory
 
     Returns:
         Relative path if file is within project, None otherwise
     """
-    try:
-        abs_path = Path(absolute_path).resolve()
-        proj_path = Path(project_dir).resolve()
+    abs_path = os.path.abspath(absolute_path)
+    if abs_path == proj_path:
+        return "."
+
+    # Require a separator after the project path so "/proj" does not match "/project"
+    prefix = proj_path if proj_path.endswith(os.sep) else proj_path + os.sep
+    if abs_path.startswith(prefix):
+        return abs_path[len(prefix) :]
+    return None
+
+
+def _get_dataset_loading_code(dataset: dict[str, Any], proj_path: str | None) -> str:
+    """
+    Generate the R statement(s) that load a single dataset.
+
+    Args:
+        dataset: Dataset dictionary with name, path and format keys
+        proj_path: Optional normalized project directory used to build relative paths
+
+    Returns:
+        str: R loading code for the dataset
+    """
+    name = dataset["name"]
+    absolute_path = dataset["path"]
+    format_type = dataset["format"]
+
+    # Determine whether to use relative or absolute path
+    if proj_path is not None:
+        relative_path = _convert_to_relative_path(absolute_path, proj_path)
+        path_to_use = relative_path if relative_path else absolute_path
+    else:
+        path_to_use = absolute_path
+
+    # Get appropriate format loader (cached per format name) and generate loading code
+    loader = _LOADER_CACHE.get(format_type)
+    if loader is None:
+        handler = get_format_handler_by_name(format_type)
+        if handler:
+            loader = _LOADER_CACHE[format_type] = handler.get_loading_code
+    if loader:
+        return loader(name, path_to_use)
+
+    # Fallback for unknown formats (shouldn't happen with validated input)
+    return (
+        f'# WARNING: Unknown format "{format_type}" for {name}\n'
+        f'# {name} <- load_data("{path_to_use}")  # Implement manually'
+    )
+
+
+@lru_cache(maxsize=128)
+def _cdisc_join_keys_line(dataset_names: tuple[str, ...]) -> str:
+    """Render the default CDISC join_keys line, memoized per sorted dataset name tuple."""
+    dataset_names_str = '", "'.join(dataset_names)
+    return f'  join_keys = default_cdisc_join_keys[c("{dataset_names_str}")]'
+
+
+def _generate_data_loading_impl(
+    datasets: list[dict[str, Any]], project_directory: str | None = None
+) -> tuple[str, list[dict[str, Any]]]:
+    """
+    Generate data loading code along with the datasets sorted by name.
+
+    The datasets are sorted by name once here so callers formatting the response
+    can reuse the order instead of sorting again.
+
+    Returns:
+        tuple: (R code, datasets sorted by name)
+    """
+    # Validate input
+    if not datasets:
+        raise ValueError("No datasets provided. At least one dataset is required.")
+
+    # Sort datasets alphabetically by name for consistent output
+    sorted_datasets: list[dict[str, Any]] = sorted(datasets, key=_dataset_name)
+
+    # The project directory is the same for every dataset, so normalize it only once
+    proj_path = _normalize_project_dir(project_directory)
+
+    # Single pass over the datasets; only these per-dataset pieces are variable
+    loading_parts: list[str] = []
+    has_non_standard = False
+    for dataset in sorted_datasets:
+        loading_parts.append(_get_dataset_loading_code(dataset, proj_path))
+        if not has_non_standard and not dataset["is_standard_adam"]:
+            has_non_standard = True
 
-        # Check if the file is within the project directory
-        if abs_path.is_relative_to(proj_path):
-            return str(abs_path.relative_to(proj_path))
-        return None
-    except (ValueError, RuntimeError):
-        return None
+    # Add join keys section
+    if has_non_standard:
+        join_keys = _NON_STANDARD_JOIN_KEYS
+    else:
+        # Use default CDISC join keys for standard datasets
+        join_keys = _cdisc_join_keys_line(tuple(map(_dataset_name, sorted_datasets)))
+
+    # Generate teal_data() call with dataset assignments
+    loading_block = "\n".join(loading_parts)
+    assignments = "".join(f"  {name} = {name},\n" for name in map(_dataset_name, sorted_datasets))
+
+    code = (
+        f"{_DATA_LOADING_HEADER}{loading_block}\n\n"
+        "## Data reproducible code ----\n"
+        f"data <- teal_data(\n{assignments}{join_keys}\n)\n"
+    )
+    return code, sorted_datasets
 
 
 def generate_data_loading_code(
@@ -89,75 +236,42 @@ def generate_data_loading_code(
         ADSL <- readRDS("/home/user/myproject/data/ADSL.Rds")
         ...
     """
-    # Validate input
-    if not datasets:
-        raise ValueError("No datasets provided. At least one dataset is required.")
-
-    lines = []
+    code, _ = _generate_data_loading_impl(datasets, project_directory)
+    return code
 
-    # Library import
-    lines.append("library(teal)")
-    lines.append("")
 
-    # Sort datasets alphabetically by name for consistent output
-    sorted_datasets = sorted(datasets, key=lambda d: d["name"])
-
-    dataset_names = []
-    has_non_standard = False
-
-    # Generate loading code for each dataset
-    for dataset in sorted_datasets:
-        name = dataset["name"]
-        absolute_path = dataset["path"]
-        format_type = dataset["format"]
-        is_standard = dataset["is_standard_adam"]
-
-        dataset_names.append(name)
-
-        if not is_standard:
-            has_non_standard = True
-
-        # Determine whether to use relative or absolute path
-        if project_directory:
-            relative_path = _convert_to_relative_path(absolute_path, project_directory)
-            path_to_use = relative_path if relative_path else absolute_path
-        else:
-            path_to_use = absolute_path
-
-        # Get appropriate format handler and generate loading code
-        handler = get_format_handler_by_name(format_type)
-        if handler:
-            loading_code = handler.get_loading_code(name, path_to_use)
-            lines.append(loading_code)
-        else:
-            # Fallback for unknown formats (shouldn't happen with validated input)
-            lines.append(f'# WARNING: Unknown format "{format_type}" for {name}')
-            lines.append(f'# {name} <- load_data("{path_to_use}")  # Implement manually')
-
-    lines.append("")
-    lines.append("## Data reproducible code ----")
-
-    # Generate teal_data() call
-    lines.append("data <- teal_data(")
+def _generate_data_loading_sync(params: GenerateDataLoadingInput) -> str:
+    """
+    Synchronous implementation of tealflow_generate_data_loading.
 
-    # Add dataset assignments
-    for name in dataset_names:
-        lines.append(f"  {name} = {name},")
+    Code generation does no I/O, so the work runs directly instead of through
+    any awaitable machinery.
+    """
+    # Only malformed dataset entries (missing keys, non-dict items, non-string
+    # values) can raise here
+    try:
+        code, sorted_datasets = _generate_data_loading_impl(
+            params.datasets, params.project_directory
+        )
+    except (AttributeError, KeyError, TypeError) as e:
+        return f"Error generating data loading code: {e!s}"
 
-    # Add join keys section
-    if has_non_standard:
-        lines.append("  # WARNING: Non-standard datasets detected.")
-        lines.append("  # You may need to configure join_keys manually.")
-        lines.append("  # join_keys = ...")
+    # Format response based on requested format
+    if params.response_format == ResponseFormat.JSON:
+        return _dumps_json(
+            {
+                "code": code,
+                "datasets": list(map(_dataset_name, sorted_datasets)),
+                "file_path": "data.R",
+                "instructions": [
+                    "Save the code as 'data.R' in your project root directory",
+                    "The app template will load this with source('data.R')",
+                ],
+            }
+        )
     else:
-        # Use default CDISC join keys for standard datasets
-        dataset_names_str = '", "'.join(dataset_names)
-        lines.append(f'  join_keys = default_cdisc_join_keys[c("{dataset_names_str}")]')
-
-    lines.append(")")
-    lines.append("")
-
-    return "\n".join(lines)
+        # Markdown format
+        return _format_data_loading_markdown(code, sorted_datasets)
 
 
 async def tealflow_generate_data_loading(params: GenerateDataLoadingInput) -> str:
@@ -189,33 +303,7 @@ async def tealflow_generate_data_loading(params: GenerateDataLoadingInput) -> st
         code = await tealflow_generate_data_loading(params)
         ```
     """
-    try:
-        # Generate the R code
-        code = generate_data_loading_code(params.datasets, params.project_directory)
-
-        # Format response based on requested format
-        if params.response_format == ResponseFormat.JSON:
-            import json
-
-            dataset_names = [ds["name"] for ds in params.datasets]
-            return json.dumps(
-                {
-                    "code": code,
-                    "datasets": dataset_names,
-                    "file_path": "data.R",
-                    "instructions": [
-                        "Save the code as 'data.R' in your project root directory",
-                        "The app template will load this with source('data.R')",
-                    ],
-                },
-                indent=2,
-            )
-        else:
-            # Markdown format
-            return _format_data_loading_markdown(code, params.datasets)
-
-    except Exception as e:
-        return f"Error generating data loading code: {e!s}"
+    return _generate_data_loading_sync(params)
 
 
 def _format_data_loading_markdown(code: str, datasets: list[dict[str, Any]]) -> str:
@@ -224,34 +312,12 @@ def _format_data_loading_markdown(code: str, datasets: list[dict[str, Any]]) ->
 
     Args:
         code: The generated R code
-        datasets: List of dataset dictionaries
+        datasets: List of dataset dictionaries, already sorted by name
 
     Returns:
         str: Markdown formatted response with code and usage instructions
     """
-    lines = []
-
-    lines.append("# Data Loading Code")
-    lines.append("")
-    lines.append("Save this code as `data.R` in your project root:")
-    lines.append("")
-    lines.append("```r")
-    lines.append(code)
-    lines.append("```")
-    lines.append("")
-
-    lines.append("## Usage")
-    lines.append("")
-    lines.append("1. Save the code above as `data.R` in your project root directory")
-    lines.append('2. The app template will load this with `source("data.R")`')
-    lines.append("")
-
-    lines.append("## Datasets Included")
-    lines.append("")
-    for dataset in sorted(datasets, key=lambda d: d["name"]):
-        name = dataset["name"]
-        format_type = dataset.get("format", "unknown")
-        lines.append(f"- **{name}** ({format_type})")
-    lines.append("")
-
-    return "\n".join(lines)
+    dataset_list = "".join(
+        f"- **{dataset['name']}** ({dataset.get('format', 'unknown')})\n" for dataset in datasets
+    )
+    return _DATA_LOADING_MARKDOWN.substitute(code=code, dataset_list=dataset_list)
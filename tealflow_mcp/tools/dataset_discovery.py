@@ -6,6 +6,7 @@ This module provides MCP tool wrappers for discovering ADaM datasets.
 
 from ..core.enums import ResponseFormat
 from ..models.input_models import DiscoverDatasetsInput
+from ..utils.formatters import _dumps_json
 from .discovery import discover_datasets
 
 
@@ -35,14 +36,17 @@ async def tealflow_discover_datasets(params: DiscoverDatasetsInput) -> str:
 
     # Format the response
     if params.response_format == ResponseFormat.JSON:
-        import json
-
-        return json.dumps(result, indent=2)
+        return _dumps_json(result)
     else:
         # Format as markdown
         return _format_discovery_markdown(result)
 
 
+def _format_size_kb(size_bytes: int) -> str:
+    """Format a file size in kilobytes for the discovery table."""
+    return f"{size_bytes / 1024:.1f} KB" if size_bytes > 0 else "0 B"
+
+
 def _format_discovery_markdown(result: dict) -> str:
     """
     Format discovery results as markdown.
@@ -73,15 +77,12 @@ def _format_discovery_markdown(result: dict) -> str:
         lines.append("| Dataset | Format | Standard | Size | Path |")
         lines.append("|---------|--------|----------|------|------|")
 
-        for dataset in result["datasets_found"]:
-            name = dataset["name"]
-            fmt = dataset["format"]
-            is_standard = "✓" if dataset["is_standard_adam"] else "Custom"
-            size_kb = dataset["size_bytes"] / 1024
-            size_str = f"{size_kb:.1f} KB" if size_kb > 0 else "0 B"
-            path = dataset["path"]
-
-            lines.append(f"| {name} | {fmt} | {is_standard} | {size_str} | `{path}` |")
+        lines.extend(
+            f"| {dataset['name']} | {dataset['format']} "
+            f"| {'✓' if dataset['is_standard_adam'] else 'Custom'} "
+            f"| {_format_size_kb(dataset['size_bytes'])} | `{dataset['path']}` |"
+            for dataset in result["datasets_found"]
+        )
 
         lines.append("")
     else:
@@ -3,6 +3,7 @@ Tool for getting dataset information (columns, types, row count, etc.).
 """
 
 import json
+from collections.abc import Iterator
 from pathlib import Path
 
 from ..core.enums import ResponseFormat
@@ -48,38 +49,39 @@ async def tealflow_get_dataset_info(params: GetDatasetInfoInput) -> str:
 
 def _format_markdown(file_path: Path, dataset_info, include_sample_values: bool) -> str:
     """Format dataset info as markdown."""
-    lines = []
+    return "\n".join(_iter_markdown_lines(file_path, dataset_info, include_sample_values))
 
-    lines.append("# Dataset Information")
-    lines.append("")
-    lines.append(f"**File**: `{file_path}`")
-    lines.append(f"**Rows**: {dataset_info.row_count:,}")
-    lines.append(f"**Columns**: {len(dataset_info.columns)}")
-    lines.append(f"**File Size**: {_format_file_size(dataset_info.file_size_bytes)}")
-    lines.append("")
 
-    lines.append("## Columns")
-    lines.append("")
+def _iter_markdown_lines(
+    file_path: Path, dataset_info, include_sample_values: bool
+) -> Iterator[str]:
+    """Yield the markdown lines for dataset info, one column at a time."""
+    yield "# Dataset Information"
+    yield ""
+    yield f"**File**: `{file_path}`"
+    yield f"**Rows**: {dataset_info.row_count:,}"
+    yield f"**Columns**: {len(dataset_info.columns)}"
+    yield f"**File Size**: {_format_file_size(dataset_info.file_size_bytes)}"
+    yield ""
+
+    yield "## Columns"
+    yield ""
 
     if include_sample_values:
         # Show detailed format with sample values
         for i, col in enumerate(dataset_info.columns, 1):
-            lines.append(f"### {i}. {col.name}")
-            lines.append(f"- **Type**: `{col.type}`")
+            yield f"### {i}. {col.name}"
+            yield f"- **Type**: `{col.type}`"
             if col.sample_values:
-                lines.append(
-                    f"- **Sample Values**: {', '.join(f'`{v}`' for v in col.sample_values)}"
-                )
-            lines.append("")
+                yield f"- **Sample Values**: {', '.join(f'`{v}`' for v in col.sample_values)}"
+            yield ""
     else:
         # Show compact table format
-        lines.append("| # | Column Name | Type |")
-        lines.append("|---|-------------|------|")
+        yield "| # | Column Name | Type |"
+        yield "|---|-------------|------|"
         for i, col in enumerate(dataset_info.columns, 1):
-            lines.append(f"| {i} | `{col.name}` | `{col.type}` |")
-        lines.append("")
-
-    return "\n".join(lines)
+            yield f"| {i} | `{col.name}` | `{col.type}` |"
+        yield ""
 
 
 def _format_json(file_path: Path, dataset_info) -> str:
@@ -101,13 +103,14 @@ def _format_json(file_path: Path, dataset_info) -> str:
     return json.dumps(output, indent=2)
 
 
+# (unit, divisor) indexed by size_bytes.bit_length() // 10: every 10 bits is one unit step
+_FILE_SIZE_UNITS = (("bytes", 1), ("KB", 1024), ("MB", 1024**2), ("GB", 1024**3))
+
+
 def _format_file_size(size_bytes: int) -> str:
     """Format file size in human-readable format."""
-    if size_bytes < 1024:
+    index = min(max(size_bytes.bit_length() - 1, 0) // 10, len(_FILE_SIZE_UNITS) - 1)
+    if index == 0:
         return f"{size_bytes} bytes"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+    unit, divisor = _FILE_SIZE_UNITS[index]
+    return f"{size_bytes / divisor:.1f} {unit}"
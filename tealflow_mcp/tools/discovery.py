@@ -5,9 +5,12 @@ This module provides functionality to discover ADaM datasets in a directory
 and extract metadata about them.
 """
 
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 # Standard ADaM dataset names (CDISC standard)
 STANDARD_ADAM_DATASETS = {
@@ -23,6 +26,22 @@ STANDARD_ADAM_DATASETS = {
     "ADMH",  # Medical History Analysis Dataset
 }
 
+# File suffixes of the supported dataset formats (lowercase)
+_SUPPORTED_SUFFIXES = (".rds", ".csv")
+
+# Candidate count from which file metadata is collected in a thread pool
+_PARALLEL_STAT_THRESHOLD = 16
+_STAT_WORKERS = 8
+
+# Matches any standard ADaM name as a whole word (surrounded by non-letters or
+# start/end). Numbers, underscores, hyphens, dots, etc. act as separators.
+# Longer names come first so a longer name wins over a shared prefix.
+_ADAM_NAME_RE = re.compile(
+    r"(?:^|[^A-Z])("
+    + "|".join(sorted(STANDARD_ADAM_DATASETS, key=lambda name: (-len(name), name)))
+    + r")(?:[^A-Z]|$)"
+)
+
 
 def discover_datasets(
     data_directory: str | Path, file_formats: list[str] | None = None, pattern: str = "AD*"
@@ -94,52 +113,61 @@ def discover_datasets(
         raise NotADirectoryError(f"Path is not a directory: {data_directory}")
 
     # Initialize results
-    datasets_found = []
     warnings: list[str] = []
     supported_formats = ["Rds", "csv"]
 
     # Normalize file formats filter (case-insensitive)
-    file_formats_lower = [fmt.lower() for fmt in file_formats] if file_formats is not None else None
-
-    # Scan directory for files
-    for file_path in data_dir.iterdir():
-        # Skip non-files
-        if not file_path.is_file():
-            continue
-
-        # Get file extension (case-insensitive)
-        file_ext = file_path.suffix.lower().lstrip(".")
-
-        # Check if file format is supported
-        if file_ext not in ["rds", "csv"]:
-            continue
-
-        # Filter by format if specified
-        if file_formats_lower is not None and file_ext not in file_formats_lower:
-            continue
-
-        # Extract ADaM dataset name
-        adam_name = _extract_adam_name(file_path.name)
-        if adam_name is None:
-            continue
-
-        # Determine the format (normalize to match expected output)
-        file_format = "Rds" if file_ext == "rds" else "csv"
-
-        # Collect metadata
-        dataset_info = {
-            "name": adam_name,
-            "path": str(file_path.absolute()),
-            "format": file_format,
-            "is_standard_adam": adam_name in STANDARD_ADAM_DATASETS,
-            "size_bytes": file_path.stat().st_size,
-            "readable": _check_readable(file_path),
+    file_formats_lower = (
+        frozenset(fmt.lower() for fmt in file_formats) if file_formats is not None else None
+    )
+
+    # Scan directory for files; DirEntry carries the file type from the listing,
+    # so only the matching candidates need stat()/access() calls afterwards
+    candidates: list[_DatasetCandidate] = []
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            # Check if file format is supported (case-insensitive) before any
+            # other per-entry work, so unrelated files are skipped cheaply
+            name_lower = entry.name.lower()
+            if not name_lower.endswith(_SUPPORTED_SUFFIXES):
+                continue
+
+            # Skip non-files
+            if not entry.is_file():
+                continue
+
+            file_ext = "rds" if name_lower.endswith(".rds") else "csv"
+
+            # Filter by format if specified
+            if file_formats_lower is not None and file_ext not in file_formats_lower:
+                continue
+
+            # Extract ADaM dataset name
+            adam_name = _extract_adam_name(entry.name)
+            if adam_name is None:
+                continue
+
+            # Determine the format (normalize to match expected output)
+            file_format = "Rds" if file_ext == "rds" else "csv"
+            candidates.append(_DatasetCandidate(entry, adam_name, file_format))
+
+    # Sort by dataset name (alphabetically) while entries are still lightweight
+    # tuples, so the result dicts are built once, already in order
+    candidates.sort(key=attrgetter("name"))
+
+    # Collect metadata
+    file_stats = _stat_candidates([candidate.entry for candidate in candidates])
+    datasets_found = [
+        {
+            "name": candidate.name,
+            "path": candidate.entry.path,
+            "format": candidate.format,
+            "is_standard_adam": candidate.name in STANDARD_ADAM_DATASETS,
+            "size_bytes": size_bytes,
+            "readable": readable,
         }
-
-        datasets_found.append(dataset_info)
-
-    # Sort by dataset name (alphabetically)
-    datasets_found.sort(key=lambda x: str(x["name"]))
+        for candidate, (size_bytes, readable) in zip(candidates, file_stats, strict=True)
+    ]
 
     return {
         "status": "success",
@@ -151,6 +179,33 @@ def discover_datasets(
     }
 
 
+class _DatasetCandidate(NamedTuple):
+    """A directory entry that matched a supported format and an ADaM name."""
+
+    entry: os.DirEntry[str]
+    name: str
+    format: str
+
+
+def _stat_entry(entry: os.DirEntry[str]) -> tuple[int, bool]:
+    """Return the size and readability of a directory entry."""
+    return entry.stat().st_size, _check_readable(entry.path)
+
+
+def _stat_candidates(entries: list[os.DirEntry[str]]) -> list[tuple[int, bool]]:
+    """
+    Stat the candidate dataset files, in order.
+
+    On network filesystems each stat() can take milliseconds, so larger batches
+    are spread over a small thread pool to overlap the latency. Small directories
+    stay serial to avoid the pool startup cost.
+    """
+    if len(entries) < _PARALLEL_STAT_THRESHOLD:
+        return [_stat_entry(entry) for entry in entries]
+    with ThreadPoolExecutor(max_workers=_STAT_WORKERS) as executor:
+        return list(executor.map(_stat_entry, entries))
+
+
 def _extract_adam_name(filename: str) -> str | None:
     """
     Extract ADaM dataset name from filename.
@@ -177,22 +232,19 @@ def _extract_adam_name(filename: str) -> str | None:
     # Convert filename to uppercase for case-insensitive matching
     filename_upper = filename.upper()
 
+    # Every standard ADaM name starts with "AD"; skip the regex when it cannot match
+    if "AD" not in filename_upper:
+        return None
+
     # Remove file extension
     name_without_ext = filename_upper.rsplit(".", 1)[0] if "." in filename_upper else filename_upper
 
-    # Try to match each standard ADaM dataset name
-    for adam_name in STANDARD_ADAM_DATASETS:
-        # Use word boundary pattern to avoid false positives
-        # Match ADaM name as a whole word (surrounded by non-letter or start/end)
-        # Numbers, underscores, hyphens, dots, etc. act as separators
-        pattern = rf"(?:^|[^A-Z]){adam_name}(?:[^A-Z]|$)"
-        if re.search(pattern, name_without_ext):
-            return adam_name
-
-    return None
+    # Single scan for the leftmost standard ADaM dataset name
+    match = _ADAM_NAME_RE.search(name_without_ext)
+    return match.group(1) if match else None
 
 
-def _check_readable(path: Path) -> bool:
+def _check_readable(path: str) -> bool:
     """
     Check if a file is readable.
 
@@ -200,10 +252,6 @@ def _check_readable(path: Path) -> bool:
         path: Path to the file
 
     Returns:
-        bool: True if file is readable, False otherwise
+        bool: True if the current process can read the file, False otherwise
     """
-    try:
-        # Check if file exists and is readable
-        return path.exists() and path.is_file() and path.stat().st_size >= 0
-    except (OSError, PermissionError):
-        return False
+    return os.access(path, os.R_OK)
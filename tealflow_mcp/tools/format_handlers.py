@@ -5,13 +5,21 @@ This module provides an extensible system for handling different data formats
 when generating data loading code.
 """
 
+import os
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import ClassVar
 
 
 class DataFormatHandler(ABC):
     """Abstract base class for data format handlers."""
 
+    # Format name (e.g., 'Rds', 'csv') and the lowercase file suffixes it handles
+    # (e.g., ('.rds',)); subclasses set these as plain class attributes. A handler
+    # without suffixes is only found through detect().
+    format_name: ClassVar[str]
+    suffixes: ClassVar[tuple[str, ...]] = ()
+
     @abstractmethod
     def detect(self, file_path: Path) -> bool:
         """
@@ -40,60 +48,52 @@ class DataFormatHandler(ABC):
         pass
 
     @abstractmethod
-    def get_required_packages(self) -> list[str]:
+    def get_required_packages(self) -> tuple[str, ...]:
         """
-        Get list of R packages required for this format.
+        Get the R packages required for this format.
 
         Returns:
-            List of package names (empty list if base R)
+            Tuple of package names (empty tuple if base R)
         """
         pass
 
-    @property
-    @abstractmethod
-    def format_name(self) -> str:
-        """Return the format name (e.g., 'Rds', 'csv')."""
-        pass
-
 
 class RdsFormatHandler(DataFormatHandler):
     """Handler for RDS (R Data Serialization) format."""
 
+    format_name = "Rds"
+    suffixes = (".rds",)
+
     def detect(self, file_path: Path) -> bool:
         """Check if file has .Rds or .rds extension."""
-        return file_path.suffix.lower() == ".rds"
+        return os.fspath(file_path).lower().endswith(self.suffixes)
 
     def get_loading_code(self, dataset_name: str, file_path: str) -> str:
         """Generate readRDS() code."""
         return f'{dataset_name} <- readRDS("{file_path}")'
 
-    def get_required_packages(self) -> list[str]:
+    def get_required_packages(self) -> tuple[str, ...]:
         """No additional packages needed (base R)."""
-        return []
-
-    @property
-    def format_name(self) -> str:
-        return "Rds"
+        return ()
 
 
 class CsvFormatHandler(DataFormatHandler):
     """Handler for CSV format."""
 
+    format_name = "csv"
+    suffixes = (".csv",)
+
     def detect(self, file_path: Path) -> bool:
         """Check if file has .csv extension."""
-        return file_path.suffix.lower() == ".csv"
+        return os.fspath(file_path).lower().endswith(self.suffixes)
 
     def get_loading_code(self, dataset_name: str, file_path: str) -> str:
         """Generate read.csv() code with stringsAsFactors = FALSE."""
         return f'{dataset_name} <- read.csv("{file_path}", stringsAsFactors = FALSE)'
 
-    def get_required_packages(self) -> list[str]:
+    def get_required_packages(self) -> tuple[str, ...]:
         """No additional packages needed (base R)."""
-        return []
-
-    @property
-    def format_name(self) -> str:
-        return "csv"
+        return ()
 
 
 class FormatHandlerRegistry:
@@ -101,6 +101,11 @@ class FormatHandlerRegistry:
 
     def __init__(self):
         self._handlers: list[DataFormatHandler] = []
+        # Lookup tables filled at registration time; the first handler registered
+        # for a suffix or name wins, matching the registration-order scan they replace
+        self._by_suffix: dict[str, DataFormatHandler] = {}
+        self._by_name: dict[str, DataFormatHandler] = {}
+        self._supported_formats: tuple[str, ...] = ()
         self._register_default_handlers()
 
     def _register_default_handlers(self):
@@ -114,6 +119,10 @@ class FormatHandlerRegistry:
     def register(self, handler: DataFormatHandler):
         """Register a new format handler."""
         self._handlers.append(handler)
+        for suffix in handler.suffixes:
+            self._by_suffix.setdefault(suffix, handler)
+        self._by_name.setdefault(handler.format_name.lower(), handler)
+        self._supported_formats += (handler.format_name,)
 
     def get_handler(self, file_path: Path) -> DataFormatHandler | None:
         """
@@ -125,6 +134,12 @@ class FormatHandlerRegistry:
         Returns:
             Handler instance or None if no handler found
         """
+        handler = self._by_suffix.get(file_path.suffix.lower())
+        if handler is not None:
+            return handler
+
+        # Handlers may match files their suffixes do not cover (e.g. .csv.gz), so
+        # fall back to asking each one, in registration order
         for handler in self._handlers:
             if handler.detect(file_path):
                 return handler
@@ -140,15 +155,11 @@ class FormatHandlerRegistry:
         Returns:
             Handler instance or None if not found
         """
-        format_lower = format_name.lower()
-        for handler in self._handlers:
-            if handler.format_name.lower() == format_lower:
-                return handler
-        return None
+        return self._by_name.get(format_name.lower())
 
-    def get_supported_formats(self) -> list[str]:
-        """Get list of supported format names."""
-        return [handler.format_name for handler in self._handlers]
+    def get_supported_formats(self) -> tuple[str, ...]:
+        """Get the supported format names, in registration order."""
+        return self._supported_formats
 
 
 # Global registry instance
@@ -181,6 +192,6 @@ def get_format_handler_by_name(format_name: str) -> DataFormatHandler | None:
     return _registry.get_handler_by_format_name(format_name)
 
 
-def get_supported_formats() -> list[str]:
-    """Get list of supported format names."""
+def get_supported_formats() -> tuple[str, ...]:
+    """Get the supported format names."""
     return _registry.get_supported_formats()
@@ -2,11 +2,19 @@
 List modules tool implementation.
 """
 
+from collections import ChainMap
+from collections.abc import Mapping
+from typing import Any
+
 from ..core.enums import PackageFilter, ResponseFormat
-from ..data import _get_clinical_modules, _get_general_modules
+from ..data import _get_clinical_modules, _get_general_modules, _get_lowercase_index
 from ..models import ListModulesInput
 from ..utils import _format_module_list_json, _format_module_list_markdown, _truncate_response
 
+# Package filters that include each package's modules
+_CLINICAL_FILTERS = frozenset({PackageFilter.ALL, PackageFilter.CLINICAL})
+_GENERAL_FILTERS = frozenset({PackageFilter.ALL, PackageFilter.GENERAL})
+
 
 async def tealflow_list_modules(params: ListModulesInput) -> str:
     """
@@ -16,25 +24,32 @@ async def tealflow_list_modules(params: ListModulesInput) -> str:
     Formats output as markdown or JSON based on response_format parameter.
     """
     try:
-        modules_to_show = {}
+        module_maps: list[dict[str, Any]] = []
+        lowercase_maps: list[dict[str, tuple[str, str]]] = []
 
         # Load modules based on package filter
-        if params.package in [PackageFilter.ALL, PackageFilter.CLINICAL]:
+        if params.package in _CLINICAL_FILTERS:
             clinical_data = _get_clinical_modules()
-            modules_to_show.update(clinical_data.get("modules", {}))
+            module_maps.append(clinical_data.get("modules", {}))
+            lowercase_maps.append(_get_lowercase_index("clinical"))
 
-        if params.package in [PackageFilter.ALL, PackageFilter.GENERAL]:
+        if params.package in _GENERAL_FILTERS:
             general_data = _get_general_modules()
-            modules_to_show.update(general_data.get("modules", {}))
+            module_maps.append(general_data.get("modules", {}))
+            lowercase_maps.append(_get_lowercase_index("general"))
+
+        # Merge lazily instead of copying every module into a new dict; later
+        # packages take precedence, as successive dict.update() calls would
+        modules_to_show: Mapping[str, Any] = ChainMap(*reversed(module_maps))
+        lowercase_index = ChainMap(*reversed(lowercase_maps))
 
-        # Filter by category if specified
+        # Filter by category if specified; names and descriptions are lowercased once per load
         if params.category:
             category_lower = params.category.lower()
             modules_to_show = {
-                name: info
-                for name, info in modules_to_show.items()
-                if category_lower in info.get("description", "").lower()
-                or category_lower in name.lower()
+                name: modules_to_show[name]
+                for name, (name_lower, description_lower) in lowercase_index.items()
+                if category_lower in description_lower or category_lower in name_lower
             }
 
         if not modules_to_show:
@@ -2,12 +2,207 @@
 Get module details tool implementation.
 """
 
-import json
+import asyncio
+from functools import lru_cache
+from itertools import islice
+from string import Template
+from typing import Any
 
 from ..core.enums import ResponseFormat
-from ..data import _get_clinical_module_requirements, _get_clinical_modules, _get_general_modules
+from ..data import (
+    _get_clinical_module_requirements,
+    _get_clinical_modules,
+    _get_data_version,
+    _get_general_modules,
+)
 from ..models import GetModuleDetailsInput
-from ..utils import _get_r_help, _truncate_response, _validate_module_exists
+from ..utils import (
+    _dumps_json,
+    _get_r_help,
+    _lookup_module,
+    _suggest_module,
+    _truncate_response,
+)
+
+# Markdown sections; the trailing newline leaves a blank line after each section
+# once the response lines are joined
+_HEADER_SECTION = Template(
+    "# ${name}\n\n**Package**: ${package}\n**Description**: ${description}\n"
+)
+
+_REQUIRED_PARAM_SECTION = Template(
+    "### `${name}`\n- **Type**: ${type}\n- **Description**: ${description}\n"
+)
+
+# Number of optional parameters listed in the markdown response
+_MAX_OPTIONAL_PARAMS = 10
+
+_OPTIONAL_PARAM_SECTION = Template("### `${name}`\n- **Default**: `${default}`\n")
+
+_R_HELP_SECTION = Template("## R Help Documentation\n\n```\n${r_help}\n```\n")
+
+
+def _build_details_markdown(
+    module_name: str,
+    r_package: str,
+    module_info: dict[str, Any],
+    basic_info: dict[str, Any],
+    r_help: str | None,
+) -> str:
+    """Build the markdown details response for a module."""
+    lines = [
+        _HEADER_SECTION.substitute(
+            name=module_name,
+            package=r_package,
+            description=basic_info.get("description", "N/A"),
+        )
+    ]
+
+    # Required datasets
+    datasets = basic_info.get("required_datasets", [])
+    if datasets:
+        lines.append(f"**Required Datasets**: {', '.join(datasets)}")
+    else:
+        lines.append("**Required Datasets**: None (works with any data.frame)")
+
+    # Typical datasets (for flexible modules)
+    typical = basic_info.get("typical_datasets", [])
+    if typical:
+        lines.append(f"**Typical Datasets**: {', '.join(typical)}")
+
+    # Dataset requirements details
+    ds_reqs = basic_info.get("dataset_requirements", {})
+    if ds_reqs:
+        lines.append("**Dataset Requirements**:")
+        for ds_name, req_desc in ds_reqs.items():
+            lines.append(f"  - {ds_name}: {req_desc}")
+
+    # Notes (for special requirements)
+    notes = basic_info.get("notes", "")
+    if notes:
+        lines.append(f"**Note**: {notes}")
+
+    lines.append("")
+
+    # Function parameters
+    if "function_parameters" in module_info:
+        params_info = module_info["function_parameters"]
+
+        # Required parameters
+        req_params = params_info.get("required_params", {})
+        if req_params:
+            lines.append("## Required Parameters")
+            lines.append("")
+            lines.extend(
+                _REQUIRED_PARAM_SECTION.substitute(
+                    name=param_name,
+                    type=param_info.get("type", "N/A"),
+                    description=param_info.get("description", "N/A"),
+                )
+                for param_name, param_info in req_params.items()
+            )
+
+        # Optional parameters (with defaults)
+        opt_params = params_info.get("params_with_defaults", {})
+        if opt_params:
+            lines.append("## Optional Parameters (with defaults)")
+            lines.append("")
+            # Limit to first 10
+            lines.extend(
+                _OPTIONAL_PARAM_SECTION.substitute(name=param_name, default=default_value)
+                for param_name, default_value in islice(opt_params.items(), _MAX_OPTIONAL_PARAMS)
+            )
+
+            n_opt = len(opt_params)
+            if n_opt > _MAX_OPTIONAL_PARAMS:
+                lines.append(f"... and {n_opt - _MAX_OPTIONAL_PARAMS} more optional parameters")
+                lines.append("")
+
+    # Add R help documentation
+    if r_help:
+        lines.append(_R_HELP_SECTION.substitute(r_help=r_help))
+
+    return "\n".join(lines)
+
+
+def _build_details_json(
+    module_name: str,
+    r_package: str,
+    module_info: dict[str, Any],
+    basic_info: dict[str, Any],
+    r_help: str | None,
+) -> str:
+    """Build the JSON details response for a module."""
+    return _dumps_json(
+        {
+            "module_name": module_name,
+            "package": r_package,
+            "description": basic_info.get("description", ""),
+            "required_datasets": basic_info.get("required_datasets", []),
+            "typical_datasets": basic_info.get("typical_datasets", []),
+            "dataset_requirements": basic_info.get("dataset_requirements", {}),
+            "notes": basic_info.get("notes", ""),
+            "parameters": module_info.get("function_parameters", {}),
+            "r_help": r_help,
+        }
+    )
+
+
+def _fetch_r_help(module_name: str, r_package: str) -> str:
+    """
+    Get the R help text for a module, or a note explaining why it is missing.
+
+    Only successful lookups are cached (by ``_get_r_help``), so a failure such as
+    Rscript being briefly unavailable is retried on the next request.
+    """
+    try:
+        return _get_r_help(module_name, package=r_package)
+    except (ValueError, FileNotFoundError) as e:
+        # If help is not available, continue without it
+        return f"R help not available: {e}"
+
+
+@lru_cache(maxsize=256)
+def _render_module_details(
+    module_name: str,
+    package: str,
+    response_format: ResponseFormat,
+    data_version: int,
+    r_help: str,
+) -> str:
+    """
+    Render the details response for a known module.
+
+    The output only depends on the arguments and the knowledge base, so it is
+    memoized. ``data_version`` keys the cache to the current knowledge base load,
+    so entries are not reused after a reload.
+    """
+    r_package = f"teal.modules.{package}"
+
+    # Get module details based on package
+    if package == "clinical":
+        requirements_data = _get_clinical_module_requirements()
+        modules = requirements_data.get("modules", {})
+        module_info = modules.get(module_name, {})
+
+        # Also get basic info
+        clinical_data = _get_clinical_modules()
+        basic_info = clinical_data.get("modules", {}).get(module_name, {})
+
+    else:  # general
+        general_data = _get_general_modules()
+        modules = general_data.get("modules", {})
+        module_info = modules.get(module_name, {})
+        basic_info = module_info
+
+    build = (
+        _build_details_markdown
+        if response_format == ResponseFormat.MARKDOWN
+        else _build_details_json
+    )
+    response = build(module_name, r_package, module_info, basic_info, r_help)
+
+    return _truncate_response(response)
 
 
 async def tealflow_get_module_details(params: GetModuleDetailsInput) -> str:
@@ -19,132 +214,24 @@ async def tealflow_get_module_details(params: GetModuleDetailsInput) -> str:
     Includes fuzzy matching for typo suggestions.
     """
     try:
-        # Validate module exists
-        exists, package, suggestion = _validate_module_exists(params.module_name)
+        # Validate module exists; fuzzy suggestions are only computed on a miss
+        package = _lookup_module(params.module_name)
 
-        if not exists:
+        if package is None:
+            suggestion = _suggest_module(params.module_name)
             msg = f"Error: Module '{params.module_name}' not found."
             if suggestion:
                 msg += f" Did you mean '{suggestion}'?"
             msg += "\n\nUse tealflow_list_modules to see all available modules."
             return msg
 
-        # Get module details based on package
-        if package == "clinical":
-            requirements_data = _get_clinical_module_requirements()
-            modules = requirements_data.get("modules", {})
-            module_info = modules.get(params.module_name, {})
-
-            # Also get basic info
-            clinical_data = _get_clinical_modules()
-            basic_info = clinical_data.get("modules", {}).get(params.module_name, {})
-
-        else:  # general
-            general_data = _get_general_modules()
-            modules = general_data.get("modules", {})
-            module_info = modules.get(params.module_name, {})
-            basic_info = module_info
-
-        # Get R help documentation
-        r_help = None
-        r_package = f"teal.modules.{package}"
-        try:
-            r_help = _get_r_help(params.module_name, package=r_package)
-        except (ValueError, FileNotFoundError) as e:
-            # If help is not available, continue without it
-            r_help = f"R help not available: {e}"
-
-        if params.response_format == ResponseFormat.MARKDOWN:
-            lines = [f"# {params.module_name}", ""]
-            lines.append(f"**Package**: teal.modules.{package}")
-            lines.append(f"**Description**: {basic_info.get('description', 'N/A')}")
-            lines.append("")
-
-            # Required datasets
-            datasets = basic_info.get("required_datasets", [])
-            if datasets:
-                lines.append(f"**Required Datasets**: {', '.join(datasets)}")
-            else:
-                lines.append("**Required Datasets**: None (works with any data.frame)")
-
-            # Typical datasets (for flexible modules)
-            typical = basic_info.get("typical_datasets", [])
-            if typical:
-                lines.append(f"**Typical Datasets**: {', '.join(typical)}")
-
-            # Dataset requirements details
-            ds_reqs = basic_info.get("dataset_requirements", {})
-            if ds_reqs:
-                lines.append("**Dataset Requirements**:")
-                for ds_name, req_desc in ds_reqs.items():
-                    lines.append(f"  - {ds_name}: {req_desc}")
-
-            # Notes (for special requirements)
-            notes = basic_info.get("notes", "")
-            if notes:
-                lines.append(f"**Note**: {notes}")
-
-            lines.append("")
-
-            # Function parameters
-            if "function_parameters" in module_info:
-                params_info = module_info["function_parameters"]
-
-                # Required parameters
-                req_params = params_info.get("required_params", {})
-                if req_params:
-                    lines.append("## Required Parameters")
-                    lines.append("")
-                    for param_name, param_info in req_params.items():
-                        lines.append(f"### `{param_name}`")
-                        lines.append(f"- **Type**: {param_info.get('type', 'N/A')}")
-                        lines.append(f"- **Description**: {param_info.get('description', 'N/A')}")
-                        lines.append("")
-
-                # Optional parameters (with defaults)
-                opt_params = params_info.get("params_with_defaults", {})
-                if opt_params:
-                    lines.append("## Optional Parameters (with defaults)")
-                    lines.append("")
-                    for param_name, default_value in list(opt_params.items())[
-                        :10
-                    ]:  # Limit to first 10
-                        lines.append(f"### `{param_name}`")
-                        lines.append(f"- **Default**: `{default_value}`")
-                        lines.append("")
-
-                    if len(opt_params) > 10:
-                        lines.append(f"... and {len(opt_params) - 10} more optional parameters")
-                        lines.append("")
-
-            # Add R help documentation
-            if r_help:
-                lines.append("## R Help Documentation")
-                lines.append("")
-                lines.append("```")
-                lines.append(r_help)
-                lines.append("```")
-                lines.append("")
-
-            response = "\n".join(lines)
-        else:
-            # JSON format
-            response = json.dumps(
-                {
-                    "module_name": params.module_name,
-                    "package": f"teal.modules.{package}",
-                    "description": basic_info.get("description", ""),
-                    "required_datasets": basic_info.get("required_datasets", []),
-                    "typical_datasets": basic_info.get("typical_datasets", []),
-                    "dataset_requirements": basic_info.get("dataset_requirements", {}),
-                    "notes": basic_info.get("notes", ""),
-                    "parameters": module_info.get("function_parameters", {}),
-                    "r_help": r_help,
-                },
-                indent=2,
-            )
-
-        return _truncate_response(response)
+        # The help lookup may shell out to Rscript; keep it off the event loop
+        r_help = await asyncio.to_thread(
+            _fetch_r_help, params.module_name, f"teal.modules.{package}"
+        )
+        return _render_module_details(
+            params.module_name, package, params.response_format, _get_data_version(), r_help
+        )
 
     except Exception as e:
         return f"Error getting module details: {e!s}"
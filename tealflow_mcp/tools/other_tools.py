@@ -2,15 +2,23 @@
 Additional tool implementations: search, check datasets, list datasets, app template.
 """
 
-import json
+import heapq
+from collections.abc import Iterable
+from functools import lru_cache
+from itertools import product
+from operator import itemgetter
+from typing import Any, NamedTuple
 
-from ..core.constants import KNOWLEDGE_BASE_DIR
 from ..core.enums import ResponseFormat
 from ..data import (
+    _get_all_modules,
+    _get_app_template,
     _get_clinical_by_analysis_type,
     _get_clinical_modules,
+    _get_data_version,
     _get_general_by_analysis_type,
     _get_general_modules,
+    _get_lowercase_index,
 )
 from ..models import (
     CheckDatasetRequirementsInput,
@@ -18,7 +26,160 @@ from ..models import (
     ListDatasetsInput,
     SearchModulesInput,
 )
-from ..utils import _truncate_response, _validate_module_exists
+from ..utils import _dumps_json, _truncate_response, _validate_module_exists
+
+# Translation table showing category names (snake_case) as words
+_UNDERSCORE_TO_SPACE = str.maketrans("_", " ")
+
+# Length of the substrings indexed for search
+_NGRAM_SIZE = 3
+
+
+def _ngrams(text: str) -> set[str]:
+    """Get the distinct substrings of length _NGRAM_SIZE in text."""
+    return {text[i : i + _NGRAM_SIZE] for i in range(len(text) - _NGRAM_SIZE + 1)}
+
+
+def _build_ngram_index(texts: Iterable[tuple[str, str]]) -> dict[str, set[str]]:
+    """
+    Build an n-gram -> keys index from (key, lowercased text) pairs.
+
+    A key whose text contains a term is listed under every n-gram of that term,
+    so intersecting a term's postings gives a superset of the keys containing it.
+    """
+    index: dict[str, set[str]] = {}
+    for key, text in texts:
+        for ngram in _ngrams(text):
+            index.setdefault(ngram, set()).add(key)
+    return index
+
+
+def _ngram_candidates(terms: list[str], index: dict[str, set[str]]) -> set[str] | None:
+    """
+    Get the keys whose text may contain any of the terms.
+
+    Returns None when a term is too short to look up, so every key must be scanned.
+    """
+    candidates: set[str] = set()
+    for term in terms:
+        if len(term) < _NGRAM_SIZE:
+            return None
+        postings = [index.get(ngram, set()) for ngram in _ngrams(term)]
+        candidates.update(set.intersection(*postings))
+    return candidates
+
+
+class _CategoryIndex(NamedTuple):
+    """Analysis categories of both packages, indexed for module search."""
+
+    # Category name -> {"type", "description", "modules"}; general wins on clashes
+    categories: dict[str, dict[str, Any]]
+    # Module name -> names of the categories listing it, in category order
+    module_categories: dict[str, list[str]]
+    # Category name -> (name lowercased with underscores as spaces, lowercased description)
+    normalized: dict[str, tuple[str, str]]
+    # N-gram index over the normalized names and descriptions
+    ngrams: dict[str, set[str]]
+
+
+class _ModuleTextIndex(NamedTuple):
+    """Lowercased module names and descriptions of both packages, indexed for text search."""
+
+    # Module name -> (lowercased name, lowercased description); general wins on clashes
+    lowercase: dict[str, tuple[str, str]]
+    # N-gram index over the lowercased names and descriptions
+    ngrams: dict[str, set[str]]
+
+
+@lru_cache(maxsize=1)
+def _get_category_index(data_version: int) -> _CategoryIndex:
+    """
+    Build the analysis category index.
+
+    ``data_version`` keys the cache to the current knowledge base load, so the
+    index is rebuilt after a reload.
+    """
+    categories: dict[str, dict[str, Any]] = {}
+    for package_type, by_type in (
+        ("clinical", _get_clinical_by_analysis_type()),
+        ("general", _get_general_by_analysis_type()),
+    ):
+        for category_name, category_info in by_type.get("analysis_types", {}).items():
+            categories[category_name] = {
+                "type": package_type,
+                "description": category_info.get("description", ""),
+                "modules": category_info.get("modules", []),
+            }
+
+    module_categories: dict[str, list[str]] = {}
+    for category_name, category_info in categories.items():
+        for module_name in dict.fromkeys(category_info["modules"]):
+            module_categories.setdefault(module_name, []).append(category_name)
+
+    normalized = {
+        category_name: (
+            category_name.translate(_UNDERSCORE_TO_SPACE).lower(),
+            category_info["description"].lower(),
+        )
+        for category_name, category_info in categories.items()
+    }
+    ngrams = _build_ngram_index(
+        (category_name, "\n".join(texts)) for category_name, texts in normalized.items()
+    )
+
+    return _CategoryIndex(categories, module_categories, normalized, ngrams)
+
+
+@lru_cache(maxsize=1)
+def _get_module_text_index(data_version: int) -> _ModuleTextIndex:
+    """
+    Build the module text search index.
+
+    ``data_version`` keys the cache to the current knowledge base load.
+    """
+    lowercase = {**_get_lowercase_index("clinical"), **_get_lowercase_index("general")}
+    ngrams = _build_ngram_index(
+        (module_name, "\n".join(texts)) for module_name, texts in lowercase.items()
+    )
+    return _ModuleTextIndex(lowercase, ngrams)
+
+
+def warm_search_indexes() -> None:
+    """
+    Build the search indexes for the current knowledge base load ahead of the first search.
+
+    Raises:
+        OSError: If a knowledge base file cannot be read
+        ValueError: If a knowledge base file is not valid JSON
+    """
+    data_version = _get_data_version()
+    _get_category_index(data_version)
+    _get_module_text_index(data_version)
+
+
+# The markdown section formatters end each section with a newline, which leaves a
+# blank line after it once the response lines are joined
+def _format_category_section(cat_match: dict[str, Any]) -> str:
+    """Format a matching analysis category as a markdown section."""
+    modules = cat_match["modules"]
+    more = f"... and {len(modules) - 5} more\n" if len(modules) > 5 else ""
+    return (
+        f"### {cat_match['category'].translate(_UNDERSCORE_TO_SPACE).title()} ({cat_match['type'].title()})\n"
+        f"{cat_match['description']}\n"
+        f"**Modules**: {', '.join(modules[:5])}\n"
+        f"{more}"
+    )
+
+
+def _format_module_section(match: dict[str, Any], heading: str) -> str:
+    """Format a matching module as a markdown section under a heading of the given level."""
+    datasets = match["required_datasets"]
+    datasets_text = ", ".join(datasets) if datasets else "None (works with any data.frame)"
+    return (
+        f"{heading} {match['name']}\n"
+        f"**Description**: {match['description']}\n"
+        f"**Required Datasets**: {datasets_text}\n"
+    )
 
 
 async def tealflow_search_modules_by_analysis(params: SearchModulesInput) -> str:
@@ -31,59 +192,36 @@ async def tealflow_search_modules_by_analysis(params: SearchModulesInput) -> str
     """
     try:
         search_term = params.analysis_type.lower()
+        # Individual words are only matched when longer than two characters
+        long_words = tuple(word for word in search_term.split() if len(word) > 2)
+        # Terms that can give a match a positive score
+        search_terms = [search_term, *long_words]
 
-        # Load structured analysis type mappings
-        clinical_by_type = _get_clinical_by_analysis_type()
-        general_by_type = _get_general_by_analysis_type()
-
-        # Also load module details for descriptions
-        clinical_data = _get_clinical_modules()
-        general_data = _get_general_modules()
-
-        all_modules = {}
-        all_modules.update(clinical_data.get("modules", {}))
-        all_modules.update(general_data.get("modules", {}))
+        # Also load module details for descriptions (merged once per knowledge base load)
+        all_modules = _get_all_modules()
 
         # Step 1: Check for exact or partial category matches
         category_matches = []
-        all_categories = {}
-
-        # Process clinical categories
-        for category_name, category_info in clinical_by_type.get("analysis_types", {}).items():
-            all_categories[category_name] = {
-                "type": "clinical",
-                "description": category_info.get("description", ""),
-                "modules": category_info.get("modules", []),
-            }
-
-        # Process general categories
-        for category_name, category_info in general_by_type.get("analysis_types", {}).items():
-            all_categories[category_name] = {
-                "type": "general",
-                "description": category_info.get("description", ""),
-                "modules": category_info.get("modules", []),
-            }
+        all_categories, module_categories, category_texts, category_ngrams = _get_category_index(
+            _get_data_version()
+        )
 
-        # Find matching categories
+        # Find matching categories; only categories that can contain a search term are scored
+        candidate_categories = _ngram_candidates(search_terms, category_ngrams)
         for category_name, category_info in all_categories.items():
-            category_lower = category_name.lower().replace("_", " ")
-            description_lower = category_info["description"].lower()
+            if candidate_categories is not None and category_name not in candidate_categories:
+                continue
+            category_lower, description_lower = category_texts[category_name]
 
-            # Calculate category match score
-            score = 0
-            if search_term in category_lower:
-                score += 20  # Exact category match is highest priority
-            if search_term in description_lower:
-                score += 10
+            # Calculate category match score; each containment test adds its weight.
+            # Exact category match is highest priority
+            score = 20 * (search_term in category_lower) + 10 * (search_term in description_lower)
 
             # Check individual words
-            search_words = search_term.split()
-            for word in search_words:
-                if len(word) > 2:
-                    if word in category_lower:
-                        score += 8
-                    if word in description_lower:
-                        score += 4
+            score += sum(
+                8 * (word in category_lower) + 4 * (word in description_lower)
+                for word in long_words
+            )
 
             if score > 0:
                 category_matches.append(
@@ -96,15 +234,20 @@ async def tealflow_search_modules_by_analysis(params: SearchModulesInput) -> str
                     }
                 )
 
-        # Sort categories by relevance
-        category_matches.sort(key=lambda x: x["score"], reverse=True)
-
         # Step 2: If we have category matches, use those (more precise)
         if category_matches:
-            # Collect all modules from matching categories
-            matched_modules = set()
-            for cat_match in category_matches[:3]:  # Top 3 categories
-                matched_modules.update(cat_match["modules"])
+            # Most relevant categories; nlargest keeps ties in match order, like a stable sort
+            top_categories = heapq.nlargest(5, category_matches, key=itemgetter("score"))
+
+            # Relevance rank of each matching category (score, then match order); a
+            # module lists its matching categories in this order
+            match_rank = {
+                cat["category"]: (-cat["score"], position)
+                for position, cat in enumerate(category_matches)
+            }
+
+            # Collect all modules from the top 3 matching categories
+            matched_modules = set().union(*(cat["modules"] for cat in top_categories[:3]))
 
             # Get details for these modules
             matches = []
@@ -116,83 +259,62 @@ async def tealflow_search_modules_by_analysis(params: SearchModulesInput) -> str
                             "name": module_name,
                             "description": module_info.get("description", ""),
                             "required_datasets": module_info.get("required_datasets", []),
-                            "categories": [
-                                cat["category"]
-                                for cat in category_matches
-                                if module_name in cat["modules"]
-                            ],
+                            "categories": sorted(
+                                filter(match_rank.__contains__, module_categories[module_name]),
+                                key=match_rank.__getitem__,
+                            ),
                         }
                     )
 
             # Format response with categories
             if params.response_format == ResponseFormat.MARKDOWN:
-                lines = [f"# Modules for '{params.analysis_type}' Analysis", ""]
-
-                # Show matching categories first
-                lines.append("## Matching Analysis Categories")
-                lines.append("")
-                for cat_match in category_matches[:3]:
-                    lines.append(
-                        f"### {cat_match['category'].replace('_', ' ').title()} ({cat_match['type'].title()})"
-                    )
-                    lines.append(f"{cat_match['description']}")
-                    lines.append(f"**Modules**: {', '.join(cat_match['modules'][:5])}")
-                    if len(cat_match["modules"]) > 5:
-                        lines.append(f"... and {len(cat_match['modules']) - 5} more")
-                    lines.append("")
-
-                # Show detailed module list
-                lines.append(f"## All Matching Modules ({len(matches)} total)")
-                lines.append("")
-
-                for match in matches[:10]:
-                    lines.append(f"### {match['name']}")
-                    lines.append(f"**Description**: {match['description']}")
-                    datasets = match["required_datasets"]
-                    if datasets:
-                        lines.append(f"**Required Datasets**: {', '.join(datasets)}")
-                    else:
-                        lines.append("**Required Datasets**: None (works with any data.frame)")
-                    lines.append(f"**Categories**: {', '.join(match['categories'])}")
-                    lines.append("")
+                # Headings carry their own trailing newline so each is a single piece;
+                # matching categories come first, then the detailed module list
+                lines = [
+                    f"# Modules for '{params.analysis_type}' Analysis\n",
+                    "## Matching Analysis Categories\n",
+                    *map(_format_category_section, top_categories[:3]),
+                    f"## All Matching Modules ({len(matches)} total)\n",
+                    *(
+                        _format_module_section(match, "###")
+                        + f"**Categories**: {', '.join(match['categories'])}\n"
+                        for match in matches[:10]
+                    ),
+                ]
 
                 if len(matches) > 10:
                     lines.append(f"... and {len(matches) - 10} more modules")
 
                 response = "\n".join(lines)
             else:
-                response = json.dumps(
+                response = _dumps_json(
                     {
                         "query": params.analysis_type,
-                        "matching_categories": category_matches[:5],
+                        "matching_categories": top_categories,
                         "count": len(matches),
                         "modules": matches[:20],
-                    },
-                    indent=2,
+                    }
                 )
 
         else:
-            # Step 3: Fall back to text search if no category matches
+            # Step 3: Fall back to text search if no category matches; only modules
+            # that can contain the search term or one of its words are scored
+            module_texts, module_ngrams = _get_module_text_index(_get_data_version())
+            candidates = _ngram_candidates(search_terms, module_ngrams)
             matches = []
             for module_name, module_info in all_modules.items():
-                description = module_info.get("description", "").lower()
-                name_lower = module_name.lower()
+                if candidates is not None and module_name not in candidates:
+                    continue
 
-                # Calculate relevance score
-                score = 0
-                if search_term in name_lower:
-                    score += 10
-                if search_term in description:
-                    score += 5
+                name_lower, description = module_texts[module_name]
+
+                # Calculate relevance score; each containment test adds its weight
+                score = 10 * (search_term in name_lower) + 5 * (search_term in description)
 
                 # Check individual words
-                search_words = search_term.split()
-                for word in search_words:
-                    if len(word) > 2:
-                        if word in name_lower:
-                            score += 3
-                        if word in description:
-                            score += 2
+                score += sum(
+                    3 * (word in name_lower) + 2 * (word in description) for word in long_words
+                )
 
                 if score > 0:
                     matches.append(
@@ -204,8 +326,6 @@ async def tealflow_search_modules_by_analysis(params: SearchModulesInput) -> str
                         }
                     )
 
-            matches.sort(key=lambda x: x["score"], reverse=True)
-
             if not matches:
                 # Suggest available categories
                 available_categories = list(all_categories.keys())
@@ -213,35 +333,32 @@ async def tealflow_search_modules_by_analysis(params: SearchModulesInput) -> str
                     f"No modules found for '{params.analysis_type}'.\n\n"
                     "Available analysis categories:\n"
                     + "\n".join(
-                        [f"  - {cat.replace('_', ' ')}" for cat in available_categories[:10]]
+                        [
+                            f"  - {cat.translate(_UNDERSCORE_TO_SPACE)}"
+                            for cat in available_categories[:10]
+                        ]
                     )
                     + "\n\nTry terms like: 'survival', 'safety', 'efficacy', 'data exploration', 'visualization'"
                 )
 
+            # Best matches first; nlargest keeps ties in module order, like a stable sort
+            top_matches = heapq.nlargest(20, matches, key=itemgetter("score"))
+
             # Format text search results
             if params.response_format == ResponseFormat.MARKDOWN:
-                lines = [f"# Text Search Results for '{params.analysis_type}'", ""]
-                lines.append(f"Found {len(matches)} matching module(s) via text search:")
-                lines.append("")
-
-                for match in matches[:10]:
-                    lines.append(f"## {match['name']}")
-                    lines.append(f"**Description**: {match['description']}")
-                    datasets = match["required_datasets"]
-                    if datasets:
-                        lines.append(f"**Required Datasets**: {', '.join(datasets)}")
-                    else:
-                        lines.append("**Required Datasets**: None (works with any data.frame)")
-                    lines.append("")
+                lines = [
+                    f"# Text Search Results for '{params.analysis_type}'\n",
+                    f"Found {len(matches)} matching module(s) via text search:\n",
+                    *(_format_module_section(match, "##") for match in top_matches[:10]),
+                ]
 
                 if len(matches) > 10:
                     lines.append(f"... and {len(matches) - 10} more matches")
 
                 response = "\n".join(lines)
             else:
-                response = json.dumps(
-                    {"query": params.analysis_type, "count": len(matches), "matches": matches[:20]},
-                    indent=2,
+                response = _dumps_json(
+                    {"query": params.analysis_type, "count": len(matches), "matches": top_matches}
                 )
 
         return _truncate_response(response)
@@ -250,6 +367,21 @@ async def tealflow_search_modules_by_analysis(params: SearchModulesInput) -> str
         return f"Error searching modules: {e!s}"
 
 
+# BDS (Basic Data Structure) datasets
+_BDS_DATASETS = frozenset({"ADLB", "ADVS", "ADQS", "ADEG", "ADEX"})
+# BDS datasets typically containing continuous data, plus any BDS dataset
+_BDS_CONTINUOUS_DATASETS = frozenset({"ADLB", "ADVS", "ADQS"}) | _BDS_DATASETS
+# Datasets that can have binary outcomes, plus any BDS dataset
+_BDS_BINARY_DATASETS = frozenset({"ADRS"}) | _BDS_DATASETS
+
+# Required dataset types that match any of several datasets -> the datasets they match
+_FLEXIBLE_DATASET_TYPES = {
+    "BDS_DATASET": _BDS_DATASETS,
+    "BDS_CONTINUOUS": _BDS_CONTINUOUS_DATASETS,
+    "BDS_BINARY": _BDS_BINARY_DATASETS,
+}
+
+
 async def tealflow_check_dataset_requirements(params: CheckDatasetRequirementsInput) -> str:
     """
     Validate dataset availability for a specific module.
@@ -282,12 +414,9 @@ async def tealflow_check_dataset_requirements(params: CheckDatasetRequirementsIn
             module_info = general_data.get("modules", {}).get(params.module_name, {})
 
         required_datasets = module_info.get("required_datasets", [])
-        typical_datasets = module_info.get("typical_datasets", [])
-        dataset_requirements = module_info.get("dataset_requirements", {})
-        notes = module_info.get("notes", "")
         available = params.available_datasets
 
-        # Check compatibility
+        # Check compatibility; modules without requirements need nothing else looked up
         if not required_datasets:
             # General modules typically work with any data.frame
             if params.response_format == ResponseFormat.MARKDOWN:
@@ -295,56 +424,38 @@ async def tealflow_check_dataset_requirements(params: CheckDatasetRequirementsIn
                     f"# Dataset Compatibility: {params.module_name}\n\n✅ **Compatible**\n\n"
                     "This module works with any data.frame and has no specific dataset requirements."
                 )
-            return json.dumps(
+            return _dumps_json(
                 {
                     "module_name": params.module_name,
                     "compatible": True,
                     "required_datasets": [],
                     "available_datasets": available,
                     "missing_datasets": [],
-                },
-                indent=2,
+                }
             )
 
-        # Define BDS datasets (Basic Data Structure)
-        bds_datasets = ["ADLB", "ADVS", "ADQS", "ADEG", "ADEX"]
-        bds_continuous_typical = ["ADLB", "ADVS", "ADQS"]
-        bds_binary_typical = ["ADRS"]
+        typical_datasets = module_info.get("typical_datasets", [])
+        dataset_requirements = module_info.get("dataset_requirements", {})
+        notes = module_info.get("notes", "")
+        available_set = set(available)
 
         # Check each required dataset
         missing = []
         matched_datasets = {}
 
         for req_ds in required_datasets:
-            if req_ds == "BDS_DATASET":
-                # Check if any BDS dataset is available
-                matches = [ds for ds in available if ds in bds_datasets]
-                if matches:
-                    matched_datasets[req_ds] = matches
-                else:
-                    missing.append(req_ds)
-            elif req_ds == "BDS_CONTINUOUS":
-                # Check if any BDS dataset that typically has continuous data is available
-                matches = [
-                    ds for ds in available if ds in bds_continuous_typical or ds in bds_datasets
-                ]
-                if matches:
-                    matched_datasets[req_ds] = matches
-                else:
-                    missing.append(req_ds)
-            elif req_ds == "BDS_BINARY":
-                # Check if any BDS dataset that can have binary data is available
-                matches = [ds for ds in available if ds in bds_binary_typical or ds in bds_datasets]
-                if matches:
-                    matched_datasets[req_ds] = matches
-                else:
-                    missing.append(req_ds)
+            flexible_set = _FLEXIBLE_DATASET_TYPES.get(req_ds)
+            if flexible_set is not None:
+                # Flexible type - any available dataset of that kind matches
+                matches = [ds for ds in available if ds in flexible_set]
             else:
                 # Specific dataset name
-                if req_ds in available:
-                    matched_datasets[req_ds] = [req_ds]
-                else:
-                    missing.append(req_ds)
+                matches = [req_ds] if req_ds in available_set else []
+
+            if matches:
+                matched_datasets[req_ds] = matches
+            else:
+                missing.append(req_ds)
 
         compatible = len(missing) == 0
 
@@ -357,7 +468,7 @@ async def tealflow_check_dataset_requirements(params: CheckDatasetRequirementsIn
 
             for req_ds in required_datasets:
                 matches = matched_datasets.get(req_ds, [])
-                if req_ds in ["BDS_DATASET", "BDS_CONTINUOUS", "BDS_BINARY"]:
+                if req_ds in _FLEXIBLE_DATASET_TYPES:
                     # Flexible type - can use any of the matches
                     flexible_options.append((req_ds, matches))
                 else:
@@ -366,11 +477,11 @@ async def tealflow_check_dataset_requirements(params: CheckDatasetRequirementsIn
 
             # Generate combinations
             if flexible_options:
-                # For each flexible dataset type, show options
-                for _, options in flexible_options:
-                    for opt in options:
-                        combo_list = [*specific_datasets, opt]
-                        compatible_combinations.append(" + ".join(combo_list))
+                # One option for every flexible dataset type, alongside the specific datasets
+                compatible_combinations.extend(
+                    " + ".join([*specific_datasets, *combo])
+                    for combo in product(*(options for _, options in flexible_options))
+                )
             else:
                 # Only specific datasets
                 if specific_datasets:
@@ -407,7 +518,7 @@ async def tealflow_check_dataset_requirements(params: CheckDatasetRequirementsIn
 
             # Show matched flexible datasets
             for req_ds, matches in matched_datasets.items():
-                if req_ds in ["BDS_DATASET", "BDS_CONTINUOUS", "BDS_BINARY"]:
+                if req_ds in _FLEXIBLE_DATASET_TYPES:
                     lines.append(f"**Matched {req_ds}**: {', '.join(matches)}")
 
             if missing:
@@ -460,7 +571,7 @@ async def tealflow_check_dataset_requirements(params: CheckDatasetRequirementsIn
 
             response = "\n".join(lines)
         else:
-            response = json.dumps(
+            response = _dumps_json(
                 {
                     "module_name": params.module_name,
                     "compatible": compatible,
@@ -472,8 +583,7 @@ async def tealflow_check_dataset_requirements(params: CheckDatasetRequirementsIn
                     "matched_datasets": matched_datasets,
                     "dataset_requirements": dataset_requirements,
                     "notes": notes,
-                },
-                indent=2,
+                }
             )
 
         return response
@@ -482,6 +592,90 @@ async def tealflow_check_dataset_requirements(params: CheckDatasetRequirementsIn
         return f"Error checking dataset requirements: {e!s}"
 
 
+# Standard ADaM datasets available in Flow
+_FLOW_DATASETS: dict[str, dict[str, Any]] = {
+    "ADSL": {
+        "name": "ADSL",
+        "full_name": "Subject-Level Analysis Dataset",
+        "description": (
+            "Contains one record per subject with demographic and baseline characteristics. "
+            "This is the primary parent dataset used by most clinical modules."
+        ),
+        "usage": "Used in 37/37 clinical modules (100%)",
+        "type": "Parent dataset",
+    },
+    "ADTTE": {
+        "name": "ADTTE",
+        "full_name": "Time-to-Event Analysis Dataset",
+        "description": (
+            "Contains time-to-event data for survival analysis including event times and censoring information."
+        ),
+        "usage": "Used in 4 clinical modules (11%)",
+        "type": "Analysis dataset",
+        "modules": ["tm_g_km", "tm_g_forest_tte", "tm_t_coxreg", "tm_t_tte"],
+    },
+    "ADRS": {
+        "name": "ADRS",
+        "full_name": "Response Analysis Dataset",
+        "description": "Contains tumor response data and endpoints for efficacy analysis.",
+        "usage": "Used in 3 clinical modules (8%)",
+        "type": "Analysis dataset",
+        "modules": ["tm_g_forest_rsp", "tm_t_binary_outcome", "tm_t_logistic"],
+    },
+    "ADQS": {
+        "name": "ADQS",
+        "full_name": "Questionnaire Analysis Dataset",
+        "description": "Contains patient-reported outcome and quality of life questionnaire data.",
+        "usage": "Used in 3 clinical modules",
+        "type": "Analysis dataset",
+        "modules": ["tm_t_ancova", "tm_a_gee", "tm_a_mmrm"],
+    },
+    "ADAE": {
+        "name": "ADAE",
+        "full_name": "Adverse Events Analysis Dataset",
+        "description": "Contains adverse event data including severity, relationship, and outcome information.",
+        "usage": "Used in 9 clinical modules (24%)",
+        "type": "Analysis dataset",
+        "modules": [
+            "tm_g_barchart_simple",
+            "tm_g_pp_adverse_events",
+            "tm_t_events",
+            "tm_t_events_by_grade",
+        ],
+    },
+}
+
+
+@lru_cache(maxsize=2)
+def _render_dataset_list(response_format: ResponseFormat) -> str:
+    """Render the Flow dataset list; the output is static, so it is built once per format."""
+    if response_format == ResponseFormat.MARKDOWN:
+        lines = ["# Clinical Trial Datasets in Flow", ""]
+        lines.append(
+            "These are the standard ADaM datasets available in the Flow project following CDISC standards."
+        )
+        lines.append("")
+
+        for ds_name, ds_info in _FLOW_DATASETS.items():
+            lines.append(f"## {ds_name} - {ds_info['full_name']}")
+            lines.append(f"**Type**: {ds_info['type']}")
+            lines.append(f"**Description**: {ds_info['description']}")
+            lines.append(f"**Usage**: {ds_info['usage']}")
+
+            if "modules" in ds_info:
+                lines.append(f"**Key Modules**: {', '.join(ds_info['modules'][:4])}")
+
+            lines.append("")
+
+        response = "\n".join(lines)
+    else:
+        response = _dumps_json(
+            {"datasets": list(_FLOW_DATASETS.values()), "count": len(_FLOW_DATASETS)}
+        )
+
+    return response
+
+
 async def tealflow_list_datasets(params: ListDatasetsInput) -> str:
     """
     List standard ADaM datasets available in the Flow project.
@@ -491,84 +685,7 @@ async def tealflow_list_datasets(params: ListDatasetsInput) -> str:
     and key modules that use each dataset.
     """
     try:
-        # Dataset information
-        datasets = {
-            "ADSL": {
-                "name": "ADSL",
-                "full_name": "Subject-Level Analysis Dataset",
-                "description": (
-                    "Contains one record per subject with demographic and baseline characteristics. "
-                    "This is the primary parent dataset used by most clinical modules."
-                ),
-                "usage": "Used in 37/37 clinical modules (100%)",
-                "type": "Parent dataset",
-            },
-            "ADTTE": {
-                "name": "ADTTE",
-                "full_name": "Time-to-Event Analysis Dataset",
-                "description": (
-                    "Contains time-to-event data for survival analysis including event times and censoring information."
-                ),
-                "usage": "Used in 4 clinical modules (11%)",
-                "type": "Analysis dataset",
-                "modules": ["tm_g_km", "tm_g_forest_tte", "tm_t_coxreg", "tm_t_tte"],
-            },
-            "ADRS": {
-                "name": "ADRS",
-                "full_name": "Response Analysis Dataset",
-                "description": "Contains tumor response data and endpoints for efficacy analysis.",
-                "usage": "Used in 3 clinical modules (8%)",
-                "type": "Analysis dataset",
-                "modules": ["tm_g_forest_rsp", "tm_t_binary_outcome", "tm_t_logistic"],
-            },
-            "ADQS": {
-                "name": "ADQS",
-                "full_name": "Questionnaire Analysis Dataset",
-                "description": "Contains patient-reported outcome and quality of life questionnaire data.",
-                "usage": "Used in 3 clinical modules",
-                "type": "Analysis dataset",
-                "modules": ["tm_t_ancova", "tm_a_gee", "tm_a_mmrm"],
-            },
-            "ADAE": {
-                "name": "ADAE",
-                "full_name": "Adverse Events Analysis Dataset",
-                "description": "Contains adverse event data including severity, relationship, and outcome information.",
-                "usage": "Used in 9 clinical modules (24%)",
-                "type": "Analysis dataset",
-                "modules": [
-                    "tm_g_barchart_simple",
-                    "tm_g_pp_adverse_events",
-                    "tm_t_events",
-                    "tm_t_events_by_grade",
-                ],
-            },
-        }
-
-        if params.response_format == ResponseFormat.MARKDOWN:
-            lines = ["# Clinical Trial Datasets in Flow", ""]
-            lines.append(
-                "These are the standard ADaM datasets available in the Flow project following CDISC standards."
-            )
-            lines.append("")
-
-            for ds_name, ds_info in datasets.items():
-                lines.append(f"## {ds_name} - {ds_info['full_name']}")  # type: ignore[index]
-                lines.append(f"**Type**: {ds_info['type']}")  # type: ignore[index]
-                lines.append(f"**Description**: {ds_info['description']}")  # type: ignore[index]
-                lines.append(f"**Usage**: {ds_info['usage']}")  # type: ignore[index]
-
-                if "modules" in ds_info:  # type: ignore[operator]
-                    lines.append(f"**Key Modules**: {', '.join(ds_info['modules'][:4])}")  # type: ignore[index]
-
-                lines.append("")
-
-            response = "\n".join(lines)
-        else:
-            response = json.dumps(
-                {"datasets": list(datasets.values()), "count": len(datasets)}, indent=2
-            )
-
-        return response
+        return _render_dataset_list(params.response_format)
 
     except Exception as e:
         return f"Error listing datasets: {e!s}"
@@ -582,14 +699,12 @@ async def tealflow_get_app_template(params: GetAppTemplateInput) -> str:
     with usage instructions or as JSON with structured metadata.
     """
     try:
-        template_path = KNOWLEDGE_BASE_DIR / "app.template.R"
-
-        if not template_path.exists():
+        # Read once and cached until the knowledge base is reloaded
+        try:
+            template_content = _get_app_template()
+        except FileNotFoundError:
             return "Error: Template file not found at knowledge_base/app.template.R"
 
-        with open(template_path) as f:
-            template_content = f.read()
-
         if params.response_format == ResponseFormat.MARKDOWN:
             return (
                 "# Teal App Template\n\n"
@@ -626,7 +741,7 @@ async def tealflow_get_app_template(params: GetAppTemplateInput) -> str:
                 "```"
             )
         # JSON format
-        return json.dumps(
+        return _dumps_json(
             {
                 "template": template_content,
                 "file_name": "app.template.R",
@@ -637,8 +752,7 @@ async def tealflow_get_app_template(params: GetAppTemplateInput) -> str:
                     "Add modules to the modules() section",
                     "Run the app",
                 ],
-            },
-            indent=2,
+            }
         )
 
     except Exception as e:
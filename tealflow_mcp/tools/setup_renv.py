@@ -2,6 +2,7 @@
 Setup Renv Environment tool implementation.
 """
 
+import asyncio
 import json
 import subprocess
 from pathlib import Path
@@ -9,7 +10,73 @@ from typing import Any
 
 from ..core.enums import ResponseFormat
 from ..models import SetupRenvEnvironmentInput
-from ..utils import _run_r_command
+from ..utils import RCommandTimeoutError, _run_r_script
+
+# Maximum time for the whole setup script, package installation included (seconds)
+_SETUP_TIMEOUT = 1200
+
+# Progress markers printed by the setup script
+_STEP_DONE = "::STEP_DONE::"
+_STEP_ERROR = "::STEP_ERROR::"
+
+# Setup steps, in order -> error type and message reported when the step fails
+_SETUP_STEP_ERRORS = {
+    "renv_installed": ("renv_install_failed", "Failed to install renv package."),
+    "renv_initialized": ("renv_install_failed", "Failed to initialize renv."),
+    "packages_installed": ("package_install_failed", "Failed to install required packages."),
+}
+
+# Installs renv if missing, initializes it in the project and installs the required
+# packages. Each step prints a progress marker on a line of its own (output before it may
+# not end with a newline); the first failing step stops the script.
+# - renv is installed from the configured repos, falling back to CRAN if none are set
+# - If a lockfile exists, packages are restored from it (also activates renv);
+#   if not, a bare environment is initialized
+# - Only packages missing from the lockfile are installed; a fresh project gets all
+_SETUP_SCRIPT = r"""
+run_step <- function(step, expr) {
+  tryCatch(
+    {
+      force(expr)
+      cat("\n::STEP_DONE::", step, "\n", sep = "")
+    },
+    error = function(e) {
+      message(conditionMessage(e))
+      cat("\n::STEP_ERROR::", step, "::", gsub("\n", " ", conditionMessage(e)), "\n", sep = "")
+      quit(status = 1)
+    }
+  )
+}
+
+run_step("renv_installed", {
+  if (!requireNamespace("renv", quietly = TRUE)) {
+    repos <- getOption("repos")
+    if (is.null(repos) || identical(repos, c(CRAN = "@CRAN@")) || all(repos == "")) {
+      repos <- "https://cloud.r-project.org"
+    }
+    install.packages("renv", repos = repos)
+  }
+})
+
+run_step("renv_initialized", {
+  if (!file.exists("renv.lock")) renv::init(bare = TRUE) else renv::restore(prompt = FALSE)
+})
+
+run_step("packages_installed", {
+  required_packages <- c("shiny", "teal", "teal.modules.general", "teal.modules.clinical")
+
+  if (file.exists("renv.lock")) {
+    lockfile <- renv::lockfile_read("renv.lock")
+    locked_pkgs <- names(lockfile$Packages)
+    missing <- setdiff(required_packages, locked_pkgs)
+    if (length(missing) > 0) {
+      renv::install(missing, prompt = FALSE)
+    }
+  } else {
+    renv::install(required_packages, prompt = FALSE)
+  }
+})
+"""
 
 
 def _format_markdown_response(result: dict[str, Any]) -> str:
@@ -69,7 +136,10 @@ async def tealflow_setup_renv_environment(params: SetupRenvEnvironmentInput) ->
 
         # STEP 2: Ensure Rscript Exists
         try:
-            subprocess.run(["Rscript", "--version"], check=True, capture_output=True)
+            # Run in a worker thread so the version check does not block the event loop
+            await asyncio.to_thread(
+                subprocess.run, ["Rscript", "--version"], check=True, capture_output=True
+            )
         except (FileNotFoundError, subprocess.CalledProcessError):
             return json.dumps(
                 {
@@ -82,126 +152,63 @@ async def tealflow_setup_renv_environment(params: SetupRenvEnvironmentInput) ->
                 indent=2,
             )
 
-        # STEP 3: Install renv if Missing
-        # Use configured repos if available, fall back to CRAN only if not configured
-        check_renv_cmd = """
-if (!requireNamespace("renv", quietly = TRUE)) {
-  repos <- getOption("repos")
-  if (is.null(repos) || identical(repos, c(CRAN = "@CRAN@")) || all(repos == "")) {
-    repos <- "https://cloud.r-project.org"
-  }
-  install.packages("renv", repos = repos)
-}
-"""
+        # STEPS 3-5: Install renv, initialize it and install the required packages,
+        # all in a single R session so R starts up only once
+        timed_out = False
         try:
-            rc, out, err = _run_r_command(check_renv_cmd, project_path)
-            log_output(out, err)
-            if rc != 0:
-                return json.dumps(
-                    {
-                        "status": "error",
-                        "error_type": "renv_install_failed",
-                        "steps_completed": steps_completed,
-                        "message": "Failed to install renv package.",
-                        "logs_excerpt": "\n".join(logs),
-                    },
-                    indent=2,
-                )
-            steps_completed.append("renv_installed")
+            rc, out, err = await _run_r_script(_SETUP_SCRIPT, project_path, timeout=_SETUP_TIMEOUT)
+        except RCommandTimeoutError as e:
+            # Keep the progress the script reported before it was stopped
+            rc, out, err = None, e.stdout, e.stderr
+            timed_out = True
         except Exception as e:
             return json.dumps(
                 {
                     "status": "error",
                     "error_type": "renv_install_failed",
                     "steps_completed": steps_completed,
-                    "message": f"Exception installing renv: {e!s}",
+                    "message": f"Exception setting up renv: {e!s}",
                     "logs_excerpt": "\n".join(logs),
                 },
                 indent=2,
             )
 
-        # STEP 4: Initialize renv in Project
-        # If lockfile exists, restore packages (also activates renv).
-        # If not, initialize a bare environment.
-        init_renv_cmd = 'if (!file.exists("renv.lock")) renv::init(bare = TRUE) else renv::restore(prompt = FALSE)'
-
-        try:
-            rc, out, err = _run_r_command(init_renv_cmd, project_path)
-            log_output(out, err)
-            if rc != 0:
-                return json.dumps(
-                    {
-                        "status": "error",
-                        "error_type": "renv_install_failed",  # Using renv_install_failed for init failure as well based on steps? Or maybe execution_error? Instructions say renv_install_failed for step 3 and 4 failure.
-                        "steps_completed": steps_completed,
-                        "message": "Failed to initialize renv.",
-                        "logs_excerpt": "\n".join(logs),
-                    },
-                    indent=2,
-                )
-            steps_completed.append("renv_initialized")
-        except Exception as e:
-            return json.dumps(
-                {
-                    "status": "error",
-                    "error_type": "renv_install_failed",
-                    "steps_completed": steps_completed,
-                    "message": f"Exception initializing renv: {e!s}",
-                    "logs_excerpt": "\n".join(logs),
-                },
-                indent=2,
+        log_output(out, err)
+
+        # The script reports each finished step, and the step that failed, on stdout.
+        # Markers are matched anywhere in a line in case other output ran into them.
+        failed_step = None
+        for line in out.splitlines():
+            _, done, step = line.partition(_STEP_DONE)
+            if done:
+                steps_completed.append(step.strip())
+                continue
+            _, error, step = line.partition(_STEP_ERROR)
+            if error:
+                failed_step = step.partition("::")[0]
+
+        if failed_step is None and (
+            timed_out or rc != 0 or len(steps_completed) < len(_SETUP_STEP_ERRORS)
+        ):
+            # R stopped without reporting a step, or a step never reported finishing;
+            # blame the first one not completed
+            failed_step = next(
+                (step for step in _SETUP_STEP_ERRORS if step not in steps_completed),
+                "packages_installed",
             )
 
-        # STEP 5: Install Required Packages
-        # Only install packages that are missing from the lockfile.
-        # If no lockfile exists (fresh project), install all required packages.
-        install_pkgs_cmd = """
-required_packages <- c("shiny", "teal", "teal.modules.general", "teal.modules.clinical")
-
-if (file.exists("renv.lock")) {
-  lockfile <- renv::lockfile_read("renv.lock")
-  locked_pkgs <- names(lockfile$Packages)
-  missing <- setdiff(required_packages, locked_pkgs)
-  if (length(missing) > 0) {
-    renv::install(missing, prompt = FALSE)
-  }
-} else {
-  renv::install(required_packages, prompt = FALSE)
-}
-"""
-        try:
-            rc, out, err = _run_r_command(install_pkgs_cmd, project_path, timeout=600)
-            log_output(out, err)
-            if rc != 0:
-                return json.dumps(
-                    {
-                        "status": "error",
-                        "error_type": "package_install_failed",
-                        "steps_completed": steps_completed,
-                        "message": "Failed to install required packages.",
-                        "logs_excerpt": "\n".join(logs),
-                    },
-                    indent=2,
-                )
-            steps_completed.append("packages_installed")
-        except TimeoutError:
-            return json.dumps(
-                {
-                    "status": "error",
-                    "error_type": "package_install_failed",
-                    "steps_completed": steps_completed,
-                    "message": "Package installation timed out.",
-                    "logs_excerpt": "\n".join(logs),
-                },
-                indent=2,
+        if failed_step is not None:
+            error_type, message = _SETUP_STEP_ERRORS.get(
+                failed_step, ("execution_error", "Renv setup failed.")
             )
-        except Exception as e:
+            if timed_out:
+                message += f" Timed out after {_SETUP_TIMEOUT} seconds."
             return json.dumps(
                 {
                     "status": "error",
-                    "error_type": "package_install_failed",
+                    "error_type": error_type,
                     "steps_completed": steps_completed,
-                    "message": f"Exception installing packages: {e!s}",
+                    "message": message,
                     "logs_excerpt": "\n".join(logs),
                 },
                 indent=2,
@@ -2,6 +2,7 @@
 Snapshot Renv Environment tool implementation.
 """
 
+import asyncio
 import json
 import subprocess
 from pathlib import Path
@@ -63,7 +64,10 @@ async def tealflow_snapshot_renv_environment(params: SnapshotRenvEnvironmentInpu
 
         # STEP 2: Ensure Rscript Exists
         try:
-            subprocess.run(["Rscript", "--version"], check=True, capture_output=True)
+            # Run in a worker thread so the version check does not block the event loop
+            await asyncio.to_thread(
+                subprocess.run, ["Rscript", "--version"], check=True, capture_output=True
+            )
         except (FileNotFoundError, subprocess.CalledProcessError):
             return json.dumps(
                 {
@@ -91,7 +95,7 @@ async def tealflow_snapshot_renv_environment(params: SnapshotRenvEnvironmentInpu
         # STEP 4: Snapshot Environment
         snapshot_cmd = "renv::snapshot(prompt = FALSE)"
         try:
-            rc, out, err = _run_r_command(snapshot_cmd, project_path)
+            rc, out, err = await _run_r_command(snapshot_cmd, project_path)
             log_output(out, err)
             if rc != 0:
                 return json.dumps(
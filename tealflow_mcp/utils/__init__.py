@@ -3,18 +3,40 @@ Utility functions for Teal Flow MCP Server.
 """
 
 from .dataset_readers import ColumnInfo, DatasetInfo, read_dataset_info
-from .formatters import _format_module_list_json, _format_module_list_markdown, _truncate_response
-from .r_helpers import _get_r_help, _run_r_command
-from .validators import _fuzzy_match_module, _validate_module_exists
+from .formatters import (
+    _dumps_json,
+    _format_module_list_json,
+    _format_module_list_markdown,
+    _truncate_response,
+)
+from .r_helpers import (
+    RCommandTimeoutError,
+    _get_r_help,
+    _run_r_command,
+    _run_r_command_sync,
+    _run_r_script,
+)
+from .validators import (
+    _fuzzy_match_module,
+    _lookup_module,
+    _suggest_module,
+    _validate_module_exists,
+)
 
 __all__ = [
     "ColumnInfo",
     "DatasetInfo",
+    "RCommandTimeoutError",
+    "_dumps_json",
     "_format_module_list_json",
     "_format_module_list_markdown",
     "_fuzzy_match_module",
     "_get_r_help",
+    "_lookup_module",
     "_run_r_command",
+    "_run_r_command_sync",
+    "_run_r_script",
+    "_suggest_module",
     "_truncate_response",
     "_validate_module_exists",
     "read_dataset_info",
@@ -5,6 +5,7 @@ Each reader returns a standardized DatasetInfo structure with columns,
 row count, and file metadata.
 """
 
+import datetime
 import warnings
 from dataclasses import dataclass
 from pathlib import Path
@@ -54,8 +55,6 @@ def _infer_object_type(col_data: pd.Series) -> str:
     Returns:
         "integer", "numeric", "date", or "character"
     """
-    import datetime
-
     # Get non-null values
     non_null = col_data.dropna()
 
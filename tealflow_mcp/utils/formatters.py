@@ -3,12 +3,18 @@ Formatting utilities for Teal Flow MCP Server.
 """
 
 import json
+from collections.abc import Mapping
 from typing import Any
 
 from ..core.constants import CHARACTER_LIMIT
 
 
-def _format_module_list_markdown(modules: dict[str, Any], package: str) -> str:
+def _dumps_json(data: Any) -> str:
+    """Serialize data as indented JSON, the format shared by all tool responses."""
+    return json.dumps(data, indent=2)
+
+
+def _format_module_list_markdown(modules: Mapping[str, Any], package: str) -> str:
     """Format module list as markdown."""
     lines = [f"# Teal Modules ({package.title()})", ""]
 
@@ -27,7 +33,7 @@ def _format_module_list_markdown(modules: dict[str, Any], package: str) -> str:
     return "\n".join(lines)
 
 
-def _format_module_list_json(modules: dict[str, Any]) -> str:
+def _format_module_list_json(modules: Mapping[str, Any]) -> str:
     """Format module list as JSON."""
     module_list = []
     for module_name, module_info in sorted(modules.items()):
@@ -2,12 +2,83 @@
 Helper utilities for running R commands.
 """
 
+import asyncio
 import os
 import subprocess
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 
 
-def _run_r_command(command: str, cwd: Path, timeout: int = 300) -> tuple[int, str, str]:
+class RCommandTimeoutError(TimeoutError):
+    """Raised when an R process exceeds its timeout; carries the output produced so far."""
+
+    def __init__(self, message: str, stdout: str, stderr: str):
+        super().__init__(message)
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+async def _read_stream(stream: asyncio.StreamReader, buffer: bytearray) -> None:
+    """Append a process pipe's output to buffer as it arrives."""
+    while chunk := await stream.read(65536):
+        buffer += chunk
+
+
+async def _exec_rscript(args: list[str], cwd: Path, timeout: float) -> tuple[int, str, str]:
+    """
+    Run Rscript with the given arguments and collect its output.
+
+    The process is awaited without blocking the event loop, so other tool calls
+    keep being served while R runs.
+
+    Raises:
+        RCommandTimeoutError: If command execution exceeds timeout
+        FileNotFoundError: If Rscript is not found in PATH
+    """
+    env = os.environ.copy()
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "Rscript",
+            *args,
+            cwd=str(cwd),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+        )
+    except FileNotFoundError:
+        # This means Rscript is not found
+        raise FileNotFoundError("Rscript not found") from None
+
+    # Output is read into buffers as it arrives, so it survives a timeout
+    stdout, stderr = bytearray(), bytearray()
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(
+                _read_stream(process.stdout, stdout),
+                _read_stream(process.stderr, stderr),
+                process.wait(),
+            ),
+            timeout=timeout,
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise RCommandTimeoutError(
+            "Command timed out",
+            stdout.decode("utf-8", "replace"),
+            stderr.decode("utf-8", "replace"),
+        ) from None
+
+    return (
+        process.returncode,
+        stdout.decode("utf-8", "replace"),
+        stderr.decode("utf-8", "replace"),
+    )
+
+
+async def _run_r_command(command: str, cwd: Path, timeout: int = 300) -> tuple[int, str, str]:
     """
     Run an R command using Rscript -e.
 
@@ -20,35 +91,92 @@ def _run_r_command(command: str, cwd: Path, timeout: int = 300) -> tuple[int, st
         Tuple of (return_code, stdout, stderr)
 
     Raises:
-        TimeoutError: If command execution exceeds timeout
+        RCommandTimeoutError: If command execution exceeds timeout
+        FileNotFoundError: If Rscript is not found in PATH
+    """
+    return await _exec_rscript(["-e", command], cwd, timeout)
+
+
+def _run_r_command_sync(command: str, cwd: Path, timeout: int = 300) -> tuple[int, str, str]:
+    """
+    Run an R command using Rscript -e, blocking until it finishes.
+
+    For callers that are not on the event loop, e.g. code running in a worker thread.
+
+    Args:
+        command: R code to execute
+        cwd: Working directory for the R process
+        timeout: Maximum time to wait for command completion (seconds)
+
+    Returns:
+        Tuple of (return_code, stdout, stderr)
+
+    Raises:
+        RCommandTimeoutError: If command execution exceeds timeout
         FileNotFoundError: If Rscript is not found in PATH
     """
     env = os.environ.copy()
 
     try:
-        process = subprocess.Popen(
+        process = subprocess.run(
             ["Rscript", "-e", command],
             cwd=str(cwd),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+            capture_output=True,
+            timeout=timeout,
             env=env,
         )
-        stdout, stderr = process.communicate(timeout=timeout)
-        return process.returncode, stdout, stderr
-    except subprocess.TimeoutExpired:
-        process.kill()
-        stdout, stderr = process.communicate()
-        raise TimeoutError("Command timed out") from None
+    except subprocess.TimeoutExpired as e:
+        raise RCommandTimeoutError(
+            "Command timed out",
+            (e.stdout or b"").decode("utf-8", "replace"),
+            (e.stderr or b"").decode("utf-8", "replace"),
+        ) from None
     except FileNotFoundError:
         # This means Rscript is not found
         raise FileNotFoundError("Rscript not found") from None
 
+    return (
+        process.returncode,
+        process.stdout.decode("utf-8", "replace"),
+        process.stderr.decode("utf-8", "replace"),
+    )
+
+
+async def _run_r_script(script: str, cwd: Path, timeout: int = 300) -> tuple[int, str, str]:
+    """
+    Run a multi-line R script with Rscript.
+
+    The script is written to a temporary file rather than passed with -e, which
+    avoids command-line quoting and length limits.
+
+    Args:
+        script: R code to execute
+        cwd: Working directory for the R process
+        timeout: Maximum time to wait for script completion (seconds)
+
+    Returns:
+        Tuple of (return_code, stdout, stderr)
+
+    Raises:
+        RCommandTimeoutError: If script execution exceeds timeout
+        FileNotFoundError: If Rscript is not found in PATH
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".R", delete=False, encoding="utf-8") as f:
+        f.write(script)
+
+    try:
+        return await _exec_rscript([f.name], cwd, timeout)
+    finally:
+        os.unlink(f.name)
+
 
+@lru_cache(maxsize=512)
 def _get_r_help(function_name: str, package: str | None = None) -> str:
     """
     Get help documentation for an R function.
 
+    Successful lookups are cached, since each one spawns an Rscript process.
+
     Args:
         function_name: Name of the R function to get help for
         package: Optional package name to search in (e.g., "base", "stats", "shiny")
@@ -63,11 +191,9 @@ def _get_r_help(function_name: str, package: str | None = None) -> str:
     # Build the R command to get help
     r_command = f"?{package}::{function_name}" if package else f"?{function_name}"
 
-    # Use a temporary directory as cwd since we don't need a specific working directory
-    cwd = Path.cwd()
-
     try:
-        returncode, stdout, stderr = _run_r_command(r_command, cwd, timeout=30)
+        # Help lookups run synchronously (module details calls this from a worker thread)
+        returncode, stdout, stderr = _run_r_command_sync(r_command, Path.cwd(), timeout=30)
 
         # Check if help was not found (R returns exit code 0 even when not found)
         if "No documentation for" in stdout or "No documentation for" in stderr:
@@ -87,5 +213,3 @@ def _get_r_help(function_name: str, package: str | None = None) -> str:
 
     except TimeoutError:
         raise TimeoutError("Command timed out while retrieving help") from None
-    except FileNotFoundError:
-        raise FileNotFoundError("Rscript not found") from None
@@ -4,7 +4,7 @@ Validation utilities for Teal Flow MCP Server.
 
 from difflib import get_close_matches
 
-from ..data import _get_clinical_modules, _get_general_modules
+from ..data import _get_module_packages
 
 
 def _fuzzy_match_module(module_name: str, all_modules: list[str]) -> str | None:
@@ -13,6 +13,16 @@ def _fuzzy_match_module(module_name: str, all_modules: list[str]) -> str | None:
     return matches[0] if matches else None
 
 
+def _lookup_module(module_name: str) -> str | None:
+    """Return the package of a module ('clinical' or 'general'), or None if unknown."""
+    return _get_module_packages().get(module_name)
+
+
+def _suggest_module(module_name: str) -> str | None:
+    """Suggest the closest known module name; only needed when the lookup misses."""
+    return _fuzzy_match_module(module_name, list(_get_module_packages()))
+
+
 def _validate_module_exists(module_name: str) -> tuple[bool, str | None, str | None]:
     """
     Validate if a module exists and return its package.
@@ -20,17 +30,8 @@ def _validate_module_exists(module_name: str) -> tuple[bool, str | None, str | N
     Returns:
         (exists, package, suggestion)
     """
-    clinical_data = _get_clinical_modules()
-    general_data = _get_general_modules()
-
-    clinical_modules = clinical_data.get("modules", {})
-    general_modules = general_data.get("modules", {})
-
-    if module_name in clinical_modules:
-        return (True, "clinical", None)
-    if module_name in general_modules:
-        return (True, "general", None)
+    package = _lookup_module(module_name)
+    if package is not None:
+        return (True, package, None)
     # Try fuzzy matching
-    all_modules = list(clinical_modules.keys()) + list(general_modules.keys())
-    suggestion = _fuzzy_match_module(module_name, all_modules)
-    return (False, None, suggestion)
+    return (False, None, _suggest_module(module_name))
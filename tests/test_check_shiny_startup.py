@@ -15,6 +15,7 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from tealflow_mcp import CheckShinyStartupInput, tealflow_check_shiny_startup
+from tealflow_mcp.tools.check_shiny_startup import _get_log_excerpt
 
 
 @pytest.mark.asyncio
@@ -137,6 +138,21 @@ async def test_custom_filename_not_found():
         assert "myapp.R" in data["message"]
 
 
+def test_log_excerpt_truncation():
+    """Test that log excerpts keep only the last lines of long output."""
+    stdout = "\n".join(f"line {i}" for i in range(100))
+
+    excerpt = _get_log_excerpt(stdout, "", max_lines=5)
+    lines = excerpt.split("\n")
+    assert lines[0] == "... (output truncated) ..."
+    assert lines[1:] == [f"line {i}" for i in range(95, 100)]
+
+    # Short output is returned untouched
+    excerpt = _get_log_excerpt("ok", "warn", max_lines=30)
+    assert excerpt == "=== STDERR ===\nwarn\n\n=== STDOUT ===\nok"
+    assert _get_log_excerpt("  ", "") == "No output captured"
+
+
 async def main():
     """Run all tests."""
     print("Testing check_shiny_startup tool...")
@@ -426,6 +426,25 @@ class TestDataLoadingToolWrapper:
         # Check error message
         assert "Datasets list cannot be empty" in str(exc_info.value)
 
+    @mark.anyio
+    async def test_tool_non_string_format_error(self):
+        """Test tool error handling for a dataset with a non-string format."""
+        from tealflow_mcp.models.input_models import GenerateDataLoadingInput
+        from tealflow_mcp.tools.data_loading import tealflow_generate_data_loading
+
+        datasets = [
+            {
+                "name": "ADSL",
+                "path": "/data/ADSL.Rds",
+                "format": None,
+                "is_standard_adam": True,
+            },
+        ]
+
+        result = await tealflow_generate_data_loading(GenerateDataLoadingInput(datasets=datasets))
+
+        assert result.startswith("Error generating data loading code:")
+
     @mark.anyio
     async def test_tool_with_discovery_output(self):
         """Test tool integration with actual discovery output format."""
@@ -288,3 +288,17 @@ class TestDatasetDiscovery:
         assert result["count"] == 1
         # Should extract the first ADaM dataset name found
         assert result["datasets_found"][0]["name"] in ["ADSL", "ADTTE"]
+
+    def test_discover_many_files_collects_metadata(self, temp_data_dir):
+        """Test metadata for directories large enough to stat files in parallel."""
+        for i in range(20):
+            (temp_data_dir / f"site{i:02d}_ADSL.csv").write_text("x" * i)
+
+        from tealflow_mcp.tools.discovery import discover_datasets
+
+        result = discover_datasets(temp_data_dir)
+
+        assert result["count"] == 20
+        sizes = {Path(ds["path"]).name: ds["size_bytes"] for ds in result["datasets_found"]}
+        assert sizes == {f"site{i:02d}_ADSL.csv": i for i in range(20)}
+        assert all(ds["readable"] is True for ds in result["datasets_found"])
@@ -177,3 +177,8 @@ class TestExtractAdamName:
         assert _extract_adam_name("ADSL.CSV") == "ADSL"
         assert _extract_adam_name("ADSL.csv") == "ADSL"
         assert _extract_adam_name("ADSL.parquet") == "ADSL"
+
+    def test_multiple_adam_names_returns_leftmost(self):
+        """Test that the first ADaM name in the filename wins."""
+        assert _extract_adam_name("ADAE_ADSL_merged.Rds") == "ADAE"
+        assert _extract_adam_name("adsl-adtte.csv") == "ADSL"
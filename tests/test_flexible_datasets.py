@@ -2,6 +2,8 @@
 Tests for flexible dataset type support (BDS_DATASET, BDS_CONTINUOUS, BDS_BINARY).
 """
 
+import json
+
 import pytest
 
 from tealflow_mcp.core.enums import ResponseFormat
@@ -179,3 +181,26 @@ class TestFlexibleDatasetTypes:
         assert '"notes"' in result
         # GEE has note about logistic vs linear regression
         assert "logistic" in result.lower() or "regression" in result.lower()
+
+    async def test_combinations_cover_every_flexible_type(self, monkeypatch):
+        """Each combination should pick one dataset for every flexible type."""
+        from tealflow_mcp.tools import other_tools
+
+        module = {"required_datasets": ["ADSL", "BDS_CONTINUOUS", "BDS_BINARY"]}
+        monkeypatch.setattr(
+            other_tools, "_validate_module_exists", lambda name: (True, "clinical", None)
+        )
+        monkeypatch.setattr(
+            other_tools, "_get_clinical_modules", lambda: {"modules": {"tm_test": module}}
+        )
+
+        params = CheckDatasetRequirementsInput(
+            module_name="tm_test",
+            available_datasets=["ADSL", "ADLB", "ADRS"],
+            response_format=ResponseFormat.JSON,
+        )
+        result = json.loads(await tealflow_check_dataset_requirements(params))
+        assert result["compatible_combinations"] == [
+            "ADSL + ADLB + ADLB",
+            "ADSL + ADLB + ADRS",
+        ]
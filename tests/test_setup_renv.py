@@ -2,15 +2,33 @@
 Tests for setup_renv tool.
 """
 
+import asyncio
 import json
+import sys
 import unittest
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from tealflow_mcp.core.enums import ResponseFormat
 from tealflow_mcp.models import SetupRenvEnvironmentInput
 from tealflow_mcp.tools.setup_renv import tealflow_setup_renv_environment
 
+_real_create_subprocess_exec = asyncio.create_subprocess_exec
+
+
+def _mock_r_process(stdout: bytes, stderr: bytes, returncode: int) -> MagicMock:
+    """Build a finished R process mock whose pipes yield the given output."""
+    process = MagicMock()
+    process.stdout = asyncio.StreamReader()
+    process.stdout.feed_data(stdout)
+    process.stdout.feed_eof()
+    process.stderr = asyncio.StreamReader()
+    process.stderr.feed_data(stderr)
+    process.stderr.feed_eof()
+    process.wait = AsyncMock(return_value=returncode)
+    process.returncode = returncode
+    return process
+
 
 class TestSetupRenv(unittest.IsolatedAsyncioTestCase):
     """Tests for tealflow_setup_renv_environment."""
@@ -46,11 +64,11 @@ class TestSetupRenv(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result["error_type"], "rscript_not_found")
         self.assertIn("Rscript command not found", result["message"])
 
-    @patch("tealflow_mcp.tools.setup_renv.subprocess.Popen")
+    @patch("tealflow_mcp.utils.r_helpers.asyncio.create_subprocess_exec")
     @patch("tealflow_mcp.tools.setup_renv.subprocess.run")
     @patch("tealflow_mcp.tools.setup_renv.Path.exists")
     @patch("tealflow_mcp.tools.setup_renv.Path.resolve")
-    async def test_success_flow(self, mock_resolve, mock_exists, mock_run, mock_popen):
+    async def test_success_flow(self, mock_resolve, mock_exists, mock_run, mock_exec):
         """Test successful execution flow."""
         mock_resolve.return_value = self.project_path
         mock_exists.return_value = True
@@ -58,17 +76,15 @@ class TestSetupRenv(unittest.IsolatedAsyncioTestCase):
         # Mock Rscript --version check
         mock_run.return_value.returncode = 0
 
-        # Mock Popen for R commands
-        # We need to simulate 4 calls:
-        # 1. check/install renv
-        # 2. init renv
-        # 3. install packages
-        # 4. snapshot
-
-        mock_process = MagicMock()
-        mock_process.communicate.return_value = ("stdout output", "")
-        mock_process.returncode = 0
-        mock_popen.return_value = mock_process
+        # Mock the R subprocess; steps 3-5 run in a single script that reports
+        # each finished step on stdout
+        mock_exec.return_value = _mock_r_process(
+            b"::STEP_DONE::renv_installed\n"
+            b"::STEP_DONE::renv_initialized\n"
+            b"::STEP_DONE::packages_installed\n",
+            b"",
+            returncode=0,
+        )
 
         params = SetupRenvEnvironmentInput(
             project_path=str(self.project_path), response_format=ResponseFormat.JSON
@@ -89,14 +105,14 @@ class TestSetupRenv(unittest.IsolatedAsyncioTestCase):
         ]
         self.assertEqual(result["steps_completed"], expected_steps)
 
-        # Verify tool called Rscript 3 times (removed snapshot step)
-        self.assertEqual(mock_popen.call_count, 3)
+        # Verify tool started Rscript once for all setup steps
+        self.assertEqual(mock_exec.call_count, 1)
 
-    @patch("tealflow_mcp.tools.setup_renv.subprocess.Popen")
+    @patch("tealflow_mcp.utils.r_helpers.asyncio.create_subprocess_exec")
     @patch("tealflow_mcp.tools.setup_renv.subprocess.run")
     @patch("tealflow_mcp.tools.setup_renv.Path.exists")
     @patch("tealflow_mcp.tools.setup_renv.Path.resolve")
-    async def test_package_install_fail(self, mock_resolve, mock_exists, mock_run, mock_popen):
+    async def test_package_install_fail(self, mock_resolve, mock_exists, mock_run, mock_exec):
         """Test failure during package installation."""
         mock_resolve.return_value = self.project_path
         mock_exists.return_value = True
@@ -104,25 +120,15 @@ class TestSetupRenv(unittest.IsolatedAsyncioTestCase):
         # Mock Rscript --version check
         mock_run.return_value.returncode = 0
 
-        # Setup mocking for Popen calls
-        # 1. renv install -> Success (returncode 0)
-        # 2. renv init -> Success (returncode 0)
-        # 3. packages install -> Failure (returncode 1)
-
-        process_success = MagicMock()
-        process_success.communicate.return_value = ("success", "")
-        process_success.returncode = 0
-
-        process_fail = MagicMock()
-        process_fail.communicate.return_value = ("pkg install start...", "Error installing package")
-        process_fail.returncode = 1
-
-        # side_effect iterates through return values for each call
-        mock_popen.side_effect = [
-            process_success,  # renv check
-            process_success,  # renv init
-            process_fail,  # packages install
-        ]
+        # renv install and init succeed, then package installation fails
+        mock_exec.return_value = _mock_r_process(
+            b"::STEP_DONE::renv_installed\n"
+            b"::STEP_DONE::renv_initialized\n"
+            b"pkg install start...\n"
+            b"::STEP_ERROR::packages_installed::installation failed\n",
+            b"Error installing package",
+            returncode=1,
+        )
 
         params = SetupRenvEnvironmentInput(project_path=str(self.project_path))
         result_json = await tealflow_setup_renv_environment(params)
@@ -139,3 +145,96 @@ class TestSetupRenv(unittest.IsolatedAsyncioTestCase):
         self.assertIn("renv_installed", result["steps_completed"])
         self.assertIn("renv_initialized", result["steps_completed"])
         self.assertNotIn("packages_installed", result["steps_completed"])
+
+    @patch("tealflow_mcp.utils.r_helpers.asyncio.create_subprocess_exec")
+    @patch("tealflow_mcp.tools.setup_renv.subprocess.run")
+    @patch("tealflow_mcp.tools.setup_renv.Path.exists")
+    @patch("tealflow_mcp.tools.setup_renv.Path.resolve")
+    async def test_marker_after_unterminated_output(
+        self, mock_resolve, mock_exists, mock_run, mock_exec
+    ):
+        """Test markers are found after output that does not end with a newline."""
+        mock_resolve.return_value = self.project_path
+        mock_exists.return_value = True
+        mock_run.return_value.returncode = 0
+
+        # Each step's output ends without a newline right before its marker
+        mock_exec.return_value = _mock_r_process(
+            b"Installing renv...::STEP_DONE::renv_installed\n"
+            b"- Project initialized::STEP_DONE::renv_initialized\n"
+            b"Installing packages...\n::STEP_DONE::packages_installed\n",
+            b"",
+            returncode=0,
+        )
+
+        params = SetupRenvEnvironmentInput(
+            project_path=str(self.project_path), response_format=ResponseFormat.JSON
+        )
+        result = json.loads(await tealflow_setup_renv_environment(params))
+
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual(
+            result["steps_completed"],
+            ["renv_installed", "renv_initialized", "packages_installed"],
+        )
+
+    @patch("tealflow_mcp.utils.r_helpers.asyncio.create_subprocess_exec")
+    @patch("tealflow_mcp.tools.setup_renv.subprocess.run")
+    @patch("tealflow_mcp.tools.setup_renv.Path.exists")
+    @patch("tealflow_mcp.tools.setup_renv.Path.resolve")
+    async def test_exit_without_step_error(self, mock_resolve, mock_exists, mock_run, mock_exec):
+        """Test R failing without reporting a step blames the first unfinished step."""
+        mock_resolve.return_value = self.project_path
+        mock_exists.return_value = True
+        mock_run.return_value.returncode = 0
+
+        # R crashes during renv initialization, before it can report the error
+        mock_exec.return_value = _mock_r_process(
+            b"::STEP_DONE::renv_installed\n", b"Segmentation fault", returncode=139
+        )
+
+        params = SetupRenvEnvironmentInput(
+            project_path=str(self.project_path), response_format=ResponseFormat.JSON
+        )
+        result = json.loads(await tealflow_setup_renv_environment(params))
+
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["error_type"], "renv_install_failed")
+        self.assertEqual(result["message"], "Failed to initialize renv.")
+        self.assertEqual(result["steps_completed"], ["renv_installed"])
+        self.assertIn("Segmentation fault", result["logs_excerpt"])
+
+    @patch("tealflow_mcp.tools.setup_renv._SETUP_TIMEOUT", 1)
+    @patch("tealflow_mcp.utils.r_helpers.asyncio.create_subprocess_exec")
+    @patch("tealflow_mcp.tools.setup_renv.subprocess.run")
+    @patch("tealflow_mcp.tools.setup_renv.Path.exists")
+    @patch("tealflow_mcp.tools.setup_renv.Path.resolve")
+    async def test_timeout_keeps_progress(self, mock_resolve, mock_exists, mock_run, mock_exec):
+        """Test a timeout reports the step that hung and the steps finished before it."""
+        mock_resolve.return_value = self.project_path
+        mock_exists.return_value = True
+        mock_run.return_value.returncode = 0
+
+        # Stand-in for R that finishes the first step, then hangs during renv init
+        hanging_script = (
+            "import time; print('::STEP_DONE::renv_installed', flush=True); time.sleep(30)"
+        )
+
+        async def start_hanging_process(*args, **kwargs):
+            kwargs["cwd"] = None
+            return await _real_create_subprocess_exec(
+                sys.executable, "-c", hanging_script, **kwargs
+            )
+
+        mock_exec.side_effect = start_hanging_process
+
+        params = SetupRenvEnvironmentInput(
+            project_path=str(self.project_path), response_format=ResponseFormat.JSON
+        )
+        result = json.loads(await tealflow_setup_renv_environment(params))
+
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["error_type"], "renv_install_failed")
+        self.assertIn("Failed to initialize renv", result["message"])
+        self.assertIn("Timed out", result["message"])
+        self.assertEqual(result["steps_completed"], ["renv_installed"])